@@ -0,0 +1,52 @@
+"""Output-size and render-time comparison of the default and compact HTML5 modes.
+
+Usage: python3 benchmarks/html_size.py [-n RUNS] [-b BIBLE_FILE] [EDITS_FILE]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+_main_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, _main_project_dir)
+
+from tgntools.data import BibleBooks, BIBLE_FILE
+from tgntools.render import render
+from tgntools.ts import Typesetter
+from tgntools.ts.chunks import COMPRESSORS
+
+MODES = (
+    ("default", []),
+    ("compact", ["--compact"]),
+)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare default vs. compact HTML5 output size and render time")
+    ap.add_argument("-n", "--runs", type=int, default=10, help="Number of renders per mode")
+    ap.add_argument("-b", "--bible-file", default=BIBLE_FILE, help="Bible verse database file")
+    ap.add_argument("edit_list", nargs="?", default=os.path.join(_main_project_dir, "long_form.edits"),
+                    help="Edit list to render")
+    args = ap.parse_args()
+
+    bb = BibleBooks.fromfile(args.bible_file)
+    with open(args.edit_list, "rt", encoding="utf8") as fd:
+        lines = fd.readlines()
+
+    formats = sorted(COMPRESSORS)
+    print(f"{'mode':>8} {'bytes':>10} " + " ".join(f"{fmt:>10}" for fmt in formats) + f" {'render (ms)':>12}")
+    for label, argv in MODES:
+        times = []
+        for _ in range(args.runs):
+            out = io.StringIO()
+            t0 = time.perf_counter()
+            render(lines, bb, Typesetter.new("html5", argv, bb), out)
+            times.append(time.perf_counter() - t0)
+        data = out.getvalue().encode("utf8")
+        sizes = [len(COMPRESSORS[fmt][1](data)) for fmt in formats]
+        print(f"{label:>8} {len(data):>10} " + " ".join(f"{n:>10}" for n in sizes) + f" {min(times)*1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Load test for the `tt serve` rendering server.
+
+Issues REQUESTS GETs for PATH with CONCURRENCY clients in flight at a time,
+then reports throughput and p50/p99 latency.
+
+Usage: python3 benchmarks/loadtest.py [-c CONCURRENCY] [-n REQUESTS] [--host H] [--port P] PATH
+(e.g., PATH = /long_form.edits/html5)
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+
+async def fetch(host: str, port: int, path: str) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    await reader.read() # (rest of headers and body, until EOF)
+    writer.close()
+    return status
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    i = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+async def run(host: str, port: int, path: str, concurrency: int, requests: int):
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def client():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            t0 = time.perf_counter()
+            try:
+                status = await fetch(host, port, path)
+            except OSError:
+                status = None
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    print(f"{requests} requests, concurrency {concurrency}: {elapsed:.2f}s ({requests / elapsed:.1f} req/s), {errors} errors")
+    print(f"latency p50 {percentile(latencies, 50)*1000:.1f} ms   p99 {percentile(latencies, 99)*1000:.1f} ms   "
+          f"mean {statistics.mean(latencies)*1000:.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load-test the `tt serve` rendering server")
+    ap.add_argument("-c", "--concurrency", type=int, default=32, help="Concurrent clients")
+    ap.add_argument("-n", "--requests", type=int, default=500, help="Total requests")
+    ap.add_argument("--host", default="127.0.0.1", help="Server address")
+    ap.add_argument("--port", type=int, default=8088, help="Server port")
+    ap.add_argument("path", help="Request path, e.g. /long_form.edits/html5")
+    args = ap.parse_args()
+    asyncio.run(run(args.host, args.port, args.path, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
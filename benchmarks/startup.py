@@ -0,0 +1,61 @@
+"""Startup-time benchmark for the `tt` CLI.
+
+Compares wall-clock time of a `raw` render using the lazy typesetter registry
+against the old behavior of eagerly importing every built-in typesetter module
+and parsing the default Bible file at `tgntools.refs` import time (emulated
+by doing both before running the CLI module).
+
+Also reports the CLI's setup overhead alone (imports, argument parsing and typesetter
+lookup, exactly as on a real run), by rendering an empty edit list (which needs no Bible).
+
+Usage: python3 benchmarks/startup.py [-n RUNS] [EDITS_FILE]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_main_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+EAGER_IMPORTS = "import tgntools.ts.txt, tgntools.ts.html, tgntools.ts.tex, tgntools.ts.sile"
+
+LAZY = "import runpy; runpy.run_module('tgntools', run_name='__main__')"
+EAGER_SETUP = EAGER_IMPORTS + "; " + LAZY
+EAGER = EAGER_IMPORTS + "; import tgntools.refs; tgntools.refs.default_bible(); " + LAZY
+
+
+def time_runs(code: str, argv: list, runs: int) -> list:
+    env = dict(os.environ, PYTHONPATH=_main_project_dir)
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code] + argv, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark `tt EDITS raw` startup time (lazy vs. eager typesetter imports)")
+    ap.add_argument("-n", "--runs", type=int, default=10, help="Number of runs per variant")
+    ap.add_argument("edit_list", nargs="?", default=os.path.join(_main_project_dir, "short_form.edits"),
+                    help="Edit list to render")
+    args = ap.parse_args()
+
+    with tempfile.NamedTemporaryFile("wt", suffix=".edits") as empty:
+        variants = (
+            ("CLI setup, eager", EAGER_SETUP, [empty.name, "raw"]),
+            ("CLI setup, lazy", LAZY, [empty.name, "raw"]),
+            ("raw render, eager", EAGER, [args.edit_list, "raw"]),
+            ("raw render, lazy", LAZY, [args.edit_list, "raw"]),
+        )
+        for label, code, argv in variants:
+            times = time_runs(code, argv, args.runs)
+            print(f"{label:>20}: min {min(times)*1000:8.1f} ms   median {statistics.median(times)*1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
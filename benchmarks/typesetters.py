@@ -0,0 +1,60 @@
+"""Golden-output check and render-time benchmark for the built-in typesetters.
+
+Renders the repository's edit lists through every built-in typesetter against the
+fixture Bible used by the tests (see `tests/golden.py`), checks each output against its
+golden file, and reports per-typesetter render times, so behavioral regressions and
+performance changes show up together.
+
+Usage: python3 benchmarks/typesetters.py [-n RUNS] [-j JSON_FILE] [--update]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+
+_main_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, _main_project_dir)
+
+from tests.golden import EDIT_LISTS, TYPESETTERS, load_bible, read_golden, render_timed, write_golden
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Check golden outputs and time each built-in typesetter")
+    ap.add_argument("-n", "--runs", type=int, default=10, help="Number of renders per edit list and typesetter")
+    ap.add_argument("-j", "--json", default=None, metavar="FILE", help="Also record the results to this JSON file")
+    ap.add_argument("--update", default=False, action="store_true",
+                    help="Rewrite the golden outputs (after an intended output change) instead of checking them")
+    args = ap.parse_args()
+
+    bb = load_bible()
+    results = []
+    failures = 0
+    print(f"{'edit list':<18} {'typesetter':<10} {'golden':<8} {'min (ms)':>10} {'median (ms)':>12}")
+    for edit_list in EDIT_LISTS:
+        for typesetter in TYPESETTERS:
+            times = []
+            for _ in range(max(args.runs, 1)):
+                output, seconds = render_timed(edit_list, typesetter, bb)
+                times.append(seconds)
+            if args.update:
+                write_golden(edit_list, typesetter, output)
+                status = "updated"
+            else:
+                try:
+                    status = "ok" if output == read_golden(edit_list, typesetter) else "DIFFERS"
+                except FileNotFoundError:
+                    status = "MISSING"
+            failures += status in ("DIFFERS", "MISSING")
+            results.append({"edit_list": edit_list, "typesetter": typesetter, "golden": status,
+                            "min_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000})
+            print(f"{edit_list:<18} {typesetter:<10} {status:<8} {min(times)*1000:>10.2f} {statistics.median(times)*1000:>12.2f}")
+
+    if args.json:
+        with open(args.json, "wt", encoding="utf8") as fd:
+            json.dump({"runs": args.runs, "results": results}, fd, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,12 @@ local booklet = pl.class(plain)
 booklet._name = "booklet"
 
 booklet.defaultFrameset = {
+  runningHead = {
+    top = "2%ph",
+    left = "left(content)",
+    right = "right(content)",
+    bottom = "4%ph"
+  },
   content = {
     top = "5%ph",
     left = "0.8in",
@@ -24,6 +30,28 @@ function booklet:_init(options)
   self:loadPackage("raiselower")
   self:loadPackage("pdf")
   self:loadPackage("tableofcontents")
+  self:loadPackage("infonode")
+end
+
+-- Typeset the full reference of the first verse on the page into the running head.
+-- \vref[ref=...] info nodes are collected as the page's content is shipped out
+-- (which happens before endPage), so this needs no extra SILE pass.
+function booklet:endPage()
+  local refs = SILE.scratch.info.thispage.vref
+  if refs and #refs > 0 then
+    SILE.typesetNaturally(SILE.getFrame("runningHead"), function()
+      SILE.settings:toplevelState()
+      SILE.settings:set("current.parindent", SILE.nodefactory.glue())
+      SILE.call("color", { color = "#888888" }, function()
+        SILE.call("font", { size = "8pt", style = "italic" }, function()
+          SILE.call("hfill")
+          SILE.typesetter:typeset(refs[1])
+        end)
+      end)
+      SILE.call("par")
+    end)
+  end
+  return plain.endPage(self)
 end
 
 
@@ -52,6 +80,9 @@ function booklet:registerCommands()
   end)
 
   self:registerCommand("vref", function(options, content)
+    if options.ref then
+      SILE.call("info", { category = "vref", value = options.ref })
+    end
     return SILE.call("raise", { height = "4pt" }, function()
       SILE.call("color", { color = "#888888" }, function()
         SILE.call("font", { size = "8pt", style = "italic" }, function()
@@ -15,3 +15,11 @@ sys.path.insert(0, os.path.abspath(_main_project_dir))
 # Import the package (so it can be imported from this "context" module)
 import tgntools
 
+
+# a few verses, for tests that need a (tiny) Bible database
+MINI_BIBLE = (
+    "Gen|1|1| In the beginning God created the heaven and the earth.~\n"
+    "Gen|1|2| And the earth was without form, and void.~\n"
+    "Gen|2|1| Thus the heavens and the earth were finished.~\n"
+    "Exo|1|1| Now these are the names of the children of Israel.~\n"
+)
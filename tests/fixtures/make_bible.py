@@ -0,0 +1,65 @@
+"""Generate the fixture Bible (`bible.txt`) used by the golden-output tests.
+
+The fixture holds every verse the repository's edit lists refer to, plus the verse preceding
+each of them and the last verse of each chapter they touch (so chapter limits, and which
+verses are contiguous, are as in the full Bible), with deterministic placeholder text of
+varying lengths standing in for the real verse text.
+
+Usage: python3 tests/fixtures/make_bible.py [-b BIBLE_FILE]
+(BIBLE_FILE, the full Bible, only supplies book order and chapter lengths)
+"""
+import argparse
+import os
+import sys
+
+_fixtures_dir = os.path.dirname(os.path.abspath(__file__))
+_main_project_dir = os.path.join(_fixtures_dir, "..", "..")
+sys.path.insert(0, _main_project_dir)
+
+from tgntools.data import BibleBooks, VerseRef, BIBLE_FILE
+from tgntools.refs import parse_ref_spans
+
+EDIT_LISTS = ("short_form.edits", "long_form.edits")
+
+WORDS = (
+    "and", "the", "LORD", "said", "unto", "him", "behold", "I", "will", "make", "thee",
+    "a", "great", "nation", "for", "they", "went", "forth", "into", "land", "of",
+    "Israel,", "people;", "heaven", "earth:", "which", "is", "was", "in", "that", "day",
+    "saying,", "hath", "shall", "be", "upon", "them", "his", "servants", "house",
+    "every", "thing", "the", "son", "man", "Jerusalem.", "before", "God", "peace-offerings",
+)
+
+
+def verse_text(book: str, chapter: int, verse: int) -> str:
+    seed = sum(map(ord, book)) * 131 + chapter * 31 + verse * 7
+    count = 2 + seed % 13
+    words = [WORDS[(seed + i * (seed % 11 + 3)) % len(WORDS)] for i in range(count)]
+    words[0] = words[0][0].upper() + words[0][1:]
+    return " ".join(words).rstrip(",;:.") + "."
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate the fixture Bible for the golden-output tests")
+    ap.add_argument("-b", "--bible-file", default=BIBLE_FILE, help="Full Bible verse database file")
+    args = ap.parse_args()
+
+    bb = BibleBooks.fromfile(args.bible_file)
+    refs = set()
+    for name in EDIT_LISTS:
+        with open(os.path.join(_main_project_dir, name), "rt", encoding="utf8") as fd:
+            for line in fd:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    for start, end in parse_ref_spans(line, bb):
+                        refs.update(bb.refs_between(start, end))
+    refs.update(VerseRef(r.book, r.chapter, bb.last_verse(r.book, r.chapter)) for r in list(refs))
+    # (keeps referenced verses that aren't adjacent in the full Bible apart in the fixture, too)
+    refs.update(bb._refs[bb.ordinal(r) - 1] for r in list(refs) if bb.ordinal(r) > 0)
+
+    with open(os.path.join(_fixtures_dir, "bible.txt"), "wt", encoding="utf8") as fd:
+        for book, chapter, verse in sorted(refs, key=bb.ordinal):
+            fd.write(f"{book}|{chapter}|{verse}| {verse_text(book, chapter, verse)}~\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+'''Golden-output harness: renders the repository's edit lists through the built-in typesetters
+against the fixture Bible (`fixtures/bible.txt`), for comparison with `golden/` outputs.
+
+Shared by `test_golden.py` (behavior) and `benchmarks/typesetters.py` (render times).
+To regenerate the golden outputs after an intended output change, run
+`python3 benchmarks/typesetters.py --update` and review the diff.
+'''
+import io
+import os
+import time
+from typing import List, Tuple
+
+from .context import tgntools
+from tgntools.data import BibleBooks
+from tgntools.render import render
+from tgntools.ts import Typesetter, _BUILTIN_TYPESETTERS
+
+_tests_dir = os.path.dirname(os.path.abspath(__file__))
+_main_project_dir = os.path.join(_tests_dir, "..")
+
+FIXTURE_BIBLE = os.path.join(_tests_dir, "fixtures", "bible.txt")
+GOLDEN_DIR = os.path.join(_tests_dir, "golden")
+
+EDIT_LISTS = ("short_form.edits", "long_form.edits")
+TYPESETTERS = tuple(_BUILTIN_TYPESETTERS)
+
+
+def load_bible(tokenize: bool = False) -> BibleBooks:
+    bb = BibleBooks.fromfile(FIXTURE_BIBLE)
+    if tokenize:
+        bb.corpus # (built in memory; no cache file next to the fixture)
+    return bb
+
+
+def edit_list_lines(edit_list: str) -> List[str]:
+    with open(os.path.join(_main_project_dir, edit_list), "rt", encoding="utf8") as fd:
+        return fd.readlines()
+
+
+def golden_path(edit_list: str, typesetter: str) -> str:
+    stem = os.path.splitext(edit_list)[0]
+    ext = Typesetter.get_class(typesetter).file_extension
+    return os.path.join(GOLDEN_DIR, f"{stem}.{typesetter}{ext}")
+
+
+def read_golden(edit_list: str, typesetter: str) -> str:
+    with open(golden_path(edit_list, typesetter), "rt", encoding="utf8", newline="") as fd:
+        return fd.read()
+
+
+def write_golden(edit_list: str, typesetter: str, text: str):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    with open(golden_path(edit_list, typesetter), "wt", encoding="utf8", newline="") as fd:
+        fd.write(text)
+
+
+def render_timed(edit_list: str, typesetter: str, bb: BibleBooks) -> Tuple[str, float]:
+    '''Render <edit_list> with <typesetter> (default options); returns the output and render time (seconds).'''
+    lines = edit_list_lines(edit_list)
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    render(lines, bb, Typesetter.new(typesetter, [], bb), out, source_name=edit_list)
+    return out.getvalue(), time.perf_counter() - t0
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from .context import tgntools
+from tgntools.batch import Job, glob_jobs, parse_manifest, run_batch, run_job
+
+BIBLE = os.path.join(os.path.dirname(__file__), "fixtures", "bible.txt")
+
+
+def test_parse_manifest():
+    jobs = parse_manifest([
+        "# nightly\n",
+        "a.edits out/a.html html5 --compact\n",
+        "\n",
+        "'b c.edits' out/b.txt raw  # trailing comment\n",
+    ])
+    assert jobs == [
+        Job("a.edits", "out/a.html", "html5", ["--compact"]),
+        Job("b c.edits", "out/b.txt", "raw", []),
+    ]
+    for bad in ("a.edits out/a.html\n", "a.edits 'out/a.html raw\n"):
+        with pytest.raises(SyntaxError):
+            parse_manifest([bad])
+
+
+def test_glob_jobs(tmp_path):
+    (tmp_path / "x.edits").write_text("Gen 1:1\n")
+    jobs = glob_jobs([str(tmp_path / "*.edits")], ["raw", "html5", "html5 -C"], "out")
+    assert [j.output for j in jobs] == ["out/x.raw.txt", "out/x.html5-1.html", "out/x.html5-2.html"]
+    assert jobs[2].argv == ["-C"]
+
+
+def test_glob_jobs_same_stem(tmp_path):
+    for d in ("d1", "d2"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "x.edits").write_text("Gen 1:1\n")
+    (tmp_path / "y.edits").write_text("Gen 1:1\n")
+    patterns = [str(tmp_path / "d1" / "*.edits"), str(tmp_path / "d2" / "*.edits"), str(tmp_path / "*.edits")]
+    jobs = glob_jobs(patterns, ["raw"], "out")
+    assert [j.output for j in jobs] == ["out/d1/x.raw.txt", "out/d2/x.raw.txt", "out/y.raw.txt"]
+
+
+def test_unknown_typesetter_fails_job(tmp_path):
+    (tmp_path / "x.edits").write_text("Gen 1:1\n")
+    jobs = glob_jobs([str(tmp_path / "*.edits")], ["no-such-typesetter"], str(tmp_path / "out"))
+    result = run_job(jobs[0], BIBLE)
+    assert not result.ok and "unknown typesetter" in result.error
+
+
+def test_output_collision_fails_jobs(tmp_path):
+    (tmp_path / "x.edits").write_text("Gen 1:1\n")
+    out = str(tmp_path / "out.txt")
+    jobs = [Job(str(tmp_path / "x.edits"), out, "raw", []), Job(str(tmp_path / "x.edits"), out, "plain", [])]
+    results = list(run_batch(jobs, BIBLE, workers=1))
+    assert [r.ok for r in results] == [False, False]
+    assert not os.path.exists(out)
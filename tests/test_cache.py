@@ -0,0 +1,37 @@
+import os
+
+from .context import tgntools
+from tgntools.cache import RenderCache, render_key
+
+
+def test_get_put(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get("k") is None
+    cache.put("k", b"output")
+    assert cache.get("k") == b"output"
+
+
+def test_lru_eviction(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    os.utime(tmp_path / "a.out", (1, 1))
+    os.utime(tmp_path / "b.out", (2, 2))
+    assert cache.get("a") == b"12345" # refreshes "a"
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.get("c") == b"12345"
+
+
+def test_bible_keyed_by_stamp(tmp_path):
+    bible = tmp_path / "bible.txt"
+    bible.write_text("Gen|1|1| In the beginning.~\n")
+    edits = tmp_path / "x.edits"
+    edits.write_text("Gen 1:1\n")
+    bb = tgntools.BibleBooks.fromfile(str(bible))
+    tts = tgntools.ts.Typesetter.new("raw", [], bb)
+    key = render_key(str(bible), str(edits), "raw", [], tts)
+    assert render_key(str(bible), str(edits), "raw", [], tts) == key
+    os.utime(bible, ns=(1, 1))
+    assert render_key(str(bible), str(edits), "raw", [], tts) != key
@@ -0,0 +1,35 @@
+from .context import tgntools
+from tgntools.ts.chunks import ChunkedOutput, slugify, stream_dir
+
+
+def write_chunks(directory, sections):
+    co = ChunkedOutput(str(directory), ".txt")
+    for title, text in sections:
+        _, stream = co.begin(title)
+        stream.write(text)
+    return co.close()
+
+
+def test_slugify():
+    assert slugify("the call of Abram") == "the-call-of-abram"
+    assert slugify("#####") == "section"
+
+
+def test_rewrite_only_changed(tmp_path):
+    assert write_chunks(tmp_path, [("one", "a"), ("two", "b"), ("one", "c")]) == ["one.txt", "two.txt", "one-2.txt"]
+    assert write_chunks(tmp_path, [("one", "a"), ("two", "B"), ("one", "c")]) == ["two.txt"]
+    assert (tmp_path / "two.txt").read_text() == "B"
+
+
+def test_stale_chunks_removed(tmp_path):
+    write_chunks(tmp_path, [("one", "a"), ("two", "b")])
+    assert write_chunks(tmp_path, [("one", "a")]) == []
+    assert not (tmp_path / "two.txt").exists()
+
+
+def test_links_relative_to_master(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    co = ChunkedOutput(str(site / "pages"), ".html")
+    with open(site / "index.html", "wt") as master:
+        assert co.link("one.html", stream_dir(master)) == "pages/one.html"
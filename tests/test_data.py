@@ -1,4 +1,6 @@
-from .context import tgntools as tt
+import io
+
+from .context import MINI_BIBLE, tgntools as tt
 
 def test_parse_verse_line():
     v = tt.parse_verse_line("Gen|1|1| In the beginning God created the heaven and the earth.~\n")
@@ -11,3 +13,40 @@ def test_book_limits():
     bb = tt.BibleBooks.fromfile()
     assert bb.last_chapter("Gen") == 50
     assert bb.last_verse("Gen", 1) == 31
+
+def test_get_range():
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE))
+    texts = bb.get_range(tt.VerseRef("Gen", 1, 2), tt.VerseRef("Exo", 1, 1))
+    assert texts == [bb[tt.VerseRef("Gen", 1, 2)], bb[tt.VerseRef("Gen", 2, 1)], bb[tt.VerseRef("Exo", 1, 1)]]
+    assert bb.cache_info() is None
+
+def test_lru_counters():
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE), cache_size=2)
+    gen11 = tt.VerseRef("Gen", 1, 1)
+    assert bb[gen11] == bb[gen11]
+    bb.get_range(gen11, tt.VerseRef("Gen", 2, 1))
+    info = bb.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+def test_tokens():
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE))
+    gen12 = tt.VerseRef("Gen", 1, 2)
+    assert not bb.tokenized
+    assert bb.tokens(gen12) == bb[gen12].split()
+    assert bb.word_count(gen12) == 8
+    assert bb.tokenized
+    # "the" is interned once
+    assert bb.corpus.vocab.count("the") == 1
+
+def test_tokens_cache_file(tmp_path):
+    bible = tmp_path / "mini.txt"
+    bible.write_text(MINI_BIBLE, encoding="utf8")
+    bb = tt.BibleBooks.fromfile(str(bible), tokenize=True)
+    assert (tmp_path / "mini.txt.tokens").exists()
+    loaded = tt.data.TokenCorpus.load(str(bible) + ".tokens", tt.data.file_stamp(str(bible)))
+    exo11 = bb.ordinal(tt.VerseRef("Exo", 1, 1))
+    assert loaded.tokens(exo11) == bb.corpus.tokens(exo11)
+    assert list(loaded.offsets(exo11)) == list(bb.corpus.offsets(exo11))
+    assert loaded.textwrap_safe(exo11) == bb.corpus.textwrap_safe(exo11)
+    # a changed Bible file invalidates the cache
+    assert tt.data.TokenCorpus.load(str(bible) + ".tokens", (0, 0)) is None
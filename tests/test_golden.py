@@ -0,0 +1,25 @@
+import pytest
+
+from .golden import EDIT_LISTS, TYPESETTERS, load_bible, read_golden, render_timed
+
+_bibles = {}
+
+
+def _bible(tokenize: bool = False):
+    if tokenize not in _bibles:
+        _bibles[tokenize] = load_bible(tokenize)
+    return _bibles[tokenize]
+
+
+@pytest.mark.parametrize("typesetter", TYPESETTERS)
+@pytest.mark.parametrize("edit_list", EDIT_LISTS)
+def test_golden_output(edit_list, typesetter):
+    output, _ = render_timed(edit_list, typesetter, _bible())
+    assert output == read_golden(edit_list, typesetter)
+
+
+@pytest.mark.parametrize("edit_list", EDIT_LISTS)
+def test_golden_output_tokenized(edit_list):
+    # word wrapping from the token corpus must not change plain-text output
+    output, _ = render_timed(edit_list, "plain", _bible(tokenize=True))
+    assert output == read_golden(edit_list, "plain")
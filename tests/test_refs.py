@@ -49,3 +49,17 @@ def test_all():
         list(gen_ref_seq("Rom", 8, range(32, 40))) + 
         list(gen_ref_seq("Rom", 9, range(1, 3)))
     )
+
+
+def test_spans():
+    assert list(tt.parse_ref_spans("Gen 1:30-2:2; 2:4,5")) == [
+        (("Gen", 1, 30), ("Gen", 2, 2)),
+        (("Gen", 2, 4), ("Gen", 2, 5)),
+    ]
+    assert list(tt.parse_ref_spans("Rom 8:28,27")) == [(("Rom", 8, 28), ("Rom", 8, 28)), (("Rom", 8, 27), ("Rom", 8, 27))]
+
+
+def test_range_spans():
+    assert list(tt.parse_ref_spans("Gen 1:1-2:3")) == [(("Gen", 1, 1), ("Gen", 2, 3))]
+    assert list(tt.parse_ref_spans("Gen 1:1-3;1:4")) == [(("Gen", 1, 1), ("Gen", 1, 4))]
+    assert list(tt.parse_ref("Gen 1:5-3")) == [("Gen", 1, 5)]
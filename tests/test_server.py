@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .context import MINI_BIBLE, tgntools
+from .golden import FIXTURE_BIBLE
+from tgntools.server import RenderError, RenderServer
+
+
+def make_server(tmp_path):
+    (tmp_path / "bible.txt").write_text(MINI_BIBLE)
+    (tmp_path / "a.edits").write_text("# creation\nGen 1:1-2\n")
+    server = RenderServer(str(tmp_path), str(tmp_path / "bible.txt"))
+    server._pool = ThreadPoolExecutor(2)
+    return server
+
+
+def test_coalescing(tmp_path):
+    server = make_server(tmp_path)
+
+    async def burst():
+        return await asyncio.gather(*[server.render("a.edits", "raw", []) for _ in range(5)])
+
+    results = asyncio.run(burst())
+    assert results == [b"In the beginning God created the heaven and the earth.\nAnd the earth was without form, and void.\n"] * 5
+    assert (server.requests, server.renders) == (5, 1)
+
+
+def test_bad_name(tmp_path):
+    server = make_server(tmp_path)
+    with pytest.raises(RenderError):
+        asyncio.run(server.render("../a.edits", "raw", []))
+
+
+def test_file_options_rejected(tmp_path):
+    server = make_server(tmp_path)
+    for typesetter, argv in [("tex", ["-p", "/etc/hostname"]), ("html5", ["-s", "/etc/hostname"]),
+                             ("html5", ["--style", "/etc/hostname"]), ("html5", ["-Cs/etc/hostname"]),
+                             ("sile", ["--chunk-dir", str(tmp_path / "out")])]:
+        with pytest.raises(RenderError):
+            asyncio.run(server.render("a.edits", typesetter, argv))
+    assert b"Genesis 1:1 - " in asyncio.run(server.render("a.edits", "plain", ["--max-column=40"]))
+
+
+def test_option_values_bounded(tmp_path):
+    server = make_server(tmp_path)
+    for argv in [["-v", "2000"], ["-m", "0"], ["-m"], ["--max-column=x"], ["-m", "²"],
+                 ["-m", "60", "-v", "50"], ["--verse-column=30", "--max-column=45"], ["-C"]]:
+        with pytest.raises(RenderError):
+            asyncio.run(server.render("a.edits", "plain", argv))
+    with pytest.raises(RenderError):
+        asyncio.run(server.render("a.edits", "html5", ["--compact=1"]))
+    assert b"Genesis 1:1 - " in asyncio.run(server.render("a.edits", "plain", ["-m", "60", "-v", "40"]))
+
+
+def test_unknown_typesetter_message():
+    with pytest.raises(RenderError) as e:
+        tgntools.server.render_bytes("a.edits", "bogus", [], FIXTURE_BIBLE)
+    assert str(e.value) == "unknown typesetter 'bogus'"
@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from .context import tgntools as tt
+from tgntools import stream
+
+EVENTS = [
+    (stream.SECTION, "creation"),
+    (stream.VERSE, tt.VerseRef("Gen", 1, 1), "In the beginning God created the heaven and the earth."),
+    (stream.PARAGRAPH,),
+    (stream.DEBUG, "edits:3: Joh 3:16 — “quoted”"),
+    (stream.VERSE, tt.VerseRef("Joh", 3, 16), "For God so loved the world, ..."),
+]
+
+
+def record(kind):
+    out = io.BytesIO() if kind == "binary" else io.StringIO()
+    rec = stream.RECORDERS[kind]()
+    rec.start(out)
+    for event in EVENTS:
+        rec.write(event)
+    rec.finish()
+    data = out.getvalue()
+    return data if kind == "binary" else data.encode("utf8")
+
+
+def test_ndjson_roundtrip():
+    assert list(stream.read_events(io.BytesIO(record("ndjson")))) == EVENTS
+
+
+def test_binary_roundtrip():
+    assert list(stream.read_events(io.BytesIO(record("binary")))) == EVENTS
+
+
+def test_truncated_binary():
+    data = record("binary")[:-3]
+    with pytest.raises(SyntaxError):
+        list(stream.read_events(io.BytesIO(data)))
@@ -0,0 +1,133 @@
+import io
+import os
+
+import pytest
+
+from .context import MINI_BIBLE, tgntools as tt
+from .golden import load_bible
+from tgntools.render import render
+from tgntools.ts import Typesetter
+
+def test_registered_names():
+    names = Typesetter.get_registered_names()
+    for name in ("raw", "plain", "html5", "tex", "sile"):
+        assert name in names
+
+
+def test_lazy_new():
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE))
+    ts = Typesetter.new("plain", [], bb)
+    assert type(ts).__module__ == "tgntools.ts.txt"
+
+
+def test_unknown_name():
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE))
+    with pytest.raises(KeyError):
+        Typesetter.new("no-such-typesetter", [], bb)
+
+
+def test_minify_css():
+    from tgntools.ts.html import minify_css
+    assert minify_css("/* x */ div.a {\n    color: red;\n}\n\n@media screen and (min-width: 4px) { b { c: d } }") == (
+        "div.a{color:red}@media screen and (min-width:4px){b{c:d}}"
+    )
+
+
+def test_plain_fill_words():
+    import textwrap
+    bb = tt.BibleBooks(io.StringIO(MINI_BIBLE))
+    ts = Typesetter.new("plain", ["-m", "30"], bb)
+    indent = " " * 8
+    text = bb[tt.VerseRef("Gen", 1, 1)]
+    expected = textwrap.fill(text, width=30, initial_indent=indent, subsequent_indent=indent).lstrip()
+    assert ts._fill_words(text.split(), indent) == expected
+    assert ts._fill_words(["x" * 30], indent) is None
+    assert not tt.data.TokenCorpus.build(["well-known"]).textwrap_safe(0)
+    assert not tt.data.TokenCorpus.build(["two  spaces"]).textwrap_safe(0)
+    assert bb.textwrap_safe(tt.VerseRef("Gen", 1, 1), text)
+    assert not bb.textwrap_safe(tt.VerseRef("Gen", 1, 1), text + " (edited)")
+
+
+def test_sile_page_refs():
+    bb = load_bible()
+    ts = Typesetter.new("sile", ["--page-refs"], bb)
+    assert ts._prelude_file == tt.ts.sile.BOOKLET_PRELUDE_FILE
+    out = io.StringIO()
+    render(["Psa 2:1-2"], bb, ts, out)
+    assert "\\vref[ref=Ps 2:1]{Ps 2:1}" in out.getvalue()
+    assert "\\vref[ref=Ps 2:2]{2}" in out.getvalue() # (in-text references stay minimized)
+
+
+def test_sile_chunk_dir(tmp_path):
+    bb = load_bible()
+    ts = Typesetter.new("sile", ["--chunk-dir", str(tmp_path / "chunks")], bb)
+    with open(tmp_path / "out.sil", "wt", encoding="utf8") as fd:
+        render(["# prologue", "Psa 2:1", "# creation", "Gen 1:1"], bb, ts, fd)
+    master = (tmp_path / "out.sil").read_text()
+    assert "\\include[src=chunks/prologue.sil]\n\\include[src=chunks/creation.sil]\n" in master
+    assert "\\vref{Gen 1:1}" in (tmp_path / "chunks" / "creation.sil").read_text()
+
+
+def test_html_pages(tmp_path):
+    import json
+    bb = load_bible()
+    site = tmp_path / "site"
+    site.mkdir()
+    ts = Typesetter.new("html5", ["--pages", str(site / "pages")], bb)
+    with open(site / "index.html", "wt", encoding="utf8") as fd:
+        render(["# one", "Gen 1:1", "# two", "Gen 1:2", "# three", "Gen 1:3"], bb, ts, fd)
+    index = (site / "index.html").read_text()
+    assert bb[tt.VerseRef("Gen", 1, 1)] in index
+    assert bb[tt.VerseRef("Gen", 1, 2)] not in index
+    assert 'href="pages/default-html5-styles.css"' in index
+    assert 'data-manifest="pages/manifest.json"' in index
+    chunks = json.loads((site / "pages" / "manifest.json").read_text())["chunks"]
+    assert [c["title"] for c in chunks] == ["two", "three"]
+    for chunk, verse in zip(chunks, (2, 3)):
+        assert bb[tt.VerseRef("Gen", 1, verse)] in (site / "pages" / chunk["file"]).read_text()
+    assert (site / "pages" / "default-html5-styles.css").exists()
+
+
+def test_html_compact():
+    bb = load_bible()
+    out = io.StringIO()
+    render(["Gen 1:31-2:1", "Exo 3:18"], bb, Typesetter.new("html5", ["-C"], bb), out)
+    html = out.getvalue()
+    assert '<div class="t">' in html and "tgn-" not in html
+    assert html.count('<div class="k">Genesis</div>') == 1  # (not repeated on the chapter change)
+    assert '<div class="h">2</div>' in html
+    assert '<div class="k">Exodus</div>' in html
+
+
+def test_html_precompress(tmp_path):
+    import gzip
+    bb = load_bible()
+    ts = Typesetter.new("html5", ["-z", "gzip"], bb)
+    with open(tmp_path / "out.html", "wt", encoding="utf8") as fd:
+        render(["Gen 1:1"], bb, ts, fd)
+    assert gzip.decompress((tmp_path / "out.html.gz").read_bytes()) == (tmp_path / "out.html").read_bytes()
+
+
+def test_tex_chunk_dir(tmp_path):
+    bb = load_bible()
+
+    def render_chunked(lines):
+        ts = Typesetter.new("tex", ["--chunk-dir", str(tmp_path / "chunks")], bb)
+        with open(tmp_path / "out.tex", "wt", encoding="utf8") as fd:
+            render(lines, bb, ts, fd)
+        return ts._chunks.rewritten
+
+    assert render_chunked(["Gen 1:1", "# one", "Gen 1:2", "# two", "Gen 1:3"]) == ["front.tex", "one.tex", "two.tex"]
+    master = (tmp_path / "out.tex").read_text()
+    assert "\\input chunks/front.tex\n\\input chunks/one.tex\n\\input chunks/two.tex\n\\end\n" in master
+    assert bb[tt.VerseRef("Gen", 1, 1)] not in master
+    front = (tmp_path / "chunks" / "front.tex").read_text()
+    assert front.startswith("% front\n") and "\\verse {Genesis} 1:1 {" in front
+    one = (tmp_path / "chunks" / "one.tex").read_text()
+    assert "\\verse {Genesis} 1:2 {" in one and "\\discontinuity" not in one
+
+    mtime = os.stat(tmp_path / "chunks" / "one.tex").st_mtime_ns
+    assert render_chunked(["Gen 1:1", "# one", "Gen 1:2", "# two", "Gen 1:5"]) == ["two.tex"]
+    assert os.stat(tmp_path / "chunks" / "one.tex").st_mtime_ns == mtime
+    two = (tmp_path / "chunks" / "two.tex").read_text()
+    assert "\\verse {Genesis} 1:5 {" in two and "\\discontinuity" not in two # (chunks start afresh)
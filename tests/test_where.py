@@ -0,0 +1,29 @@
+import random
+
+from .context import tgntools as tt
+from .golden import load_bible
+from tgntools.where import EditListIndex, IntervalIndex
+
+def test_interval_index_matches_brute_force():
+    rng = random.Random(1)
+    intervals = []
+    for i in range(200):
+        lo = rng.randrange(1000)
+        intervals.append((lo, lo + rng.randrange(50), i))
+    index = IntervalIndex(intervals)
+    for _ in range(200):
+        lo = rng.randrange(1000)
+        hi = lo + rng.randrange(20)
+        expected = sorted((t for t in intervals if t[0] <= hi and t[1] >= lo), key=lambda t: (t[0], t[1]))
+        assert index.overlapping(lo, hi) == [t[2] for t in expected]
+
+
+def test_edit_list_queries():
+    bb = load_bible()
+    edits = EditListIndex(["# creation\n", "Gen 1:1-5,9\n", "\n", "Gen 1:10-2:3\n"], bb)
+    assert [e.line for e in edits.query("Gen 1:9")] == [2]
+    assert [e.line for e in edits.query("Gen 1:5-10")] == [2, 4]
+    assert edits.query("Gen 3:1") == []
+
+    other = EditListIndex(["Gen 2:1\n", "Gen 1:3\n"], bb)
+    assert [(a.line, b.line) for a, b in edits.overlaps(other)] == [(2, 2), (4, 1)]
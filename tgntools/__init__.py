@@ -1,3 +1,3 @@
-from .refs import parse_ref, VerseRef
+from .refs import parse_ref, parse_ref_spans, VerseRef
 from .data import BibleBooks, Verse, parse_verse_line, BIBLE_FILE
 
@@ -1,48 +1,279 @@
-"""Executable CLI tool for generating narrative output from an edit list.
+"""Executable CLI tool for generating narrative output from edit lists.
+
+Sub-commands (the first argument; `render` is assumed if it is omitted):
+
+* render: typeset one edit list (to standard output or a file)
+* batch: typeset many edit list/typesetter combinations over a process pool
+* resolve: resolve an edit list into a serialized verse stream (see `stream.py`)
+* typeset: typeset a serialized verse stream (from standard input or a file)
+* serve: run an HTTP rendering server (see `server.py`)
+* where: find the edit list lines covering given references (or another edit list's lines)
 """
 import argparse
+import io
+import os
 import sys
-from typing import IO
-
-from .refs import parse_ref
-from .data import BibleBooks, BIBLE_FILE, VerseRef
-from .ts import Typesetter
-from .ts import txt, html, tex, sile  # trigger autoregistration of all available typesetters
-
-
-ap = argparse.ArgumentParser(description="Parse and typeset an edit list.")
-ap.add_argument("-b", "--bible-file", default=None, type=str,
-                help="Bible verse database file.")
-ap.add_argument("-d", "--debug", default=False, action="store_true",
-                help="DEBUG MODE: show edit list lines and verse references.")
-ap.add_argument("edit_list", type=str, metavar="EDITS_FILE", help="Reference edit list file.")
-ap.add_argument("typesetter", choices=Typesetter.get_registered_names(), help="Use the named typsetter (which may take additional CLI args)")
-args, extra_argv = ap.parse_known_args()
-
-bb = BibleBooks.fromfile(args.bible_file or BIBLE_FILE)
-tts = Typesetter.new(args.typesetter, extra_argv, bb)
-
-tts.start(sys.stdout)
-emitted_para_break = False
-with open(args.edit_list, "rt", encoding="utf8") as fd:
-    for i, line in enumerate(fd):
-        line = line.strip()
-        if args.debug:
-            tts.debug(f"{args.edit_list}:{i+1}: {line}")
-        if line.startswith("#"):
-            continue
-
-        emitted_verse = False
-        for vr in parse_ref(line, bb):
-            tts.feed(vr, bb[vr])
-            emitted_verse = True
-            emitted_para_break = False
-
-        # emit a paragraph break if we encountered a non-comment, non-verse line
-        # (but only once, until after we've seen more verses)
-        if not emitted_verse:
-            if not emitted_para_break:
-                tts.paragraph()
-                emitted_para_break = True
-
-tts.finish()
+from typing import IO, List
+
+from .data import LazyBibleBooks, BIBLE_FILE, VerseRef
+from .render import render_file
+from .ts import Typesetter  # typesetter modules are imported on demand by Typesetter.new
+
+# (no argparse choices: listing them would scan installed packages for plugin typesetters on every run)
+TYPESETTER_HELP = ("Use the named typesetter (which may take additional CLI args); built-in: "
+                   + ", ".join(Typesetter.get_registered_names(discover=False)) + ", or any installed plugin")
+
+
+def new_typesetter(ap: argparse.ArgumentParser, name: str, argv: List[str], bb) -> Typesetter:
+    """Create the named typesetter, reporting unknown names as usage errors."""
+    try:
+        return Typesetter.new(name, argv, bb)
+    except KeyError as e:
+        ap.error(e.args[0])
+
+
+def render_main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description="Parse and typeset an edit list.")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file.")
+    ap.add_argument("-d", "--debug", default=False, action="store_true",
+                    help="DEBUG MODE: show edit list lines and verse references.")
+    ap.add_argument("-o", "--output", default=None, type=str,
+                    help="Write output to this file (default: standard output).")
+    ap.add_argument("--cache-dir", default=os.environ.get("TGN_CACHE_DIR"), type=str,
+                    help="Serve/store rendered output from/in this cache directory (default: $TGN_CACHE_DIR, if set).")
+    ap.add_argument("--cache-size", default=64, type=int, metavar="MB",
+                    help="Cache size limit (least-recently-used outputs are evicted beyond it).")
+    ap.add_argument("-t", "--tokenize", default=False, action="store_true",
+                    help="Use the Bible's pre-tokenized corpus (loaded from, or built and saved to, BIBLE_FILE.tokens).")
+    ap.add_argument("edit_list", type=str, metavar="EDITS_FILE", help="Reference edit list file.")
+    ap.add_argument("typesetter", metavar="TYPESETTER", help=TYPESETTER_HELP)
+    ap.add_argument("typesetter_args", nargs=argparse.REMAINDER, metavar="...",
+                    help="Arguments for the typesetter (everything after its name).")
+    args = ap.parse_args(argv)
+    extra_argv = args.typesetter_args
+
+    # the Bible is only parsed once actually needed (i.e., not on cache hits)
+    bible_file = args.bible_file or BIBLE_FILE
+    bb = LazyBibleBooks(bible_file, tokenize=args.tokenize)
+    tts = new_typesetter(ap, args.typesetter, extra_argv, bb)
+
+    cache = key = None
+    if args.cache_dir:
+        from .cache import RenderCache, render_key
+        cache = RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        key = render_key(bible_file, args.edit_list, args.typesetter, extra_argv, tts, debug=args.debug)
+
+    out = open(args.output, "wt", encoding="utf8") if args.output else sys.stdout
+    try:
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            out.write(cached.decode("utf8"))
+        elif key:
+            buf = io.StringIO()
+            render_file(args.edit_list, bb, tts, buf, debug=args.debug)
+            out.write(buf.getvalue())
+            cache.put(key, buf.getvalue().encode("utf8"))
+        else:
+            render_file(args.edit_list, bb, tts, out, debug=args.debug)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def batch_main(argv: List[str]) -> int:
+    from .batch import glob_jobs, parse_manifest, run_batch
+
+    ap = argparse.ArgumentParser(description="Typeset many edit lists (with many typesetters) in one process pool.")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file.")
+    ap.add_argument("-j", "--jobs", default=None, type=int,
+                    help="Number of worker processes (default: one per CPU; 1 runs everything in-process).")
+    ap.add_argument("-m", "--manifest", default=None, type=str,
+                    help="Manifest file: one 'EDITS_FILE OUTPUT_FILE TYPESETTER [ARGS...]' job per line.")
+    ap.add_argument("-g", "--glob", default=[], action="append", metavar="PATTERN",
+                    help="Edit list file glob (may be repeated; combined with each --target).")
+    ap.add_argument("-t", "--target", default=[], action="append", metavar="SPEC",
+                    help="Target spec 'TYPESETTER [ARGS...]' for --glob'd edit lists (may be repeated).")
+    ap.add_argument("-O", "--out-dir", default=".", type=str,
+                    help="Output directory for --glob'd jobs.")
+    args = ap.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    jobs = []
+    if args.manifest:
+        try:
+            with open(args.manifest, "rt", encoding="utf8") as fd:
+                jobs.extend(parse_manifest(fd))
+        except OSError as e:
+            ap.error(f"cannot read manifest '{args.manifest}': {e.strerror}")
+        except SyntaxError as e:
+            ap.error(f"in manifest '{args.manifest}': {e}")
+    if args.glob:
+        if not args.target:
+            ap.error("--glob requires at least one --target")
+        if not all(t.split() for t in args.target):
+            ap.error("empty --target spec")
+        jobs.extend(glob_jobs(args.glob, args.target, args.out_dir))
+    if not jobs:
+        ap.error("no jobs (use --manifest and/or --glob/--target)")
+
+    failures = 0
+    for result in run_batch(jobs, args.bible_file or BIBLE_FILE, args.jobs):
+        job = result.job
+        status = "ok" if result.ok else "FAIL"
+        print(f"{status:<4} {result.seconds:8.3f}s  {job.edit_list} [{' '.join([job.typesetter] + job.argv)}] -> {job.output}")
+        if not result.ok:
+            failures += 1
+            print(f"     {result.error}")
+    print(f"{len(jobs) - failures}/{len(jobs)} jobs succeeded")
+    return 1 if failures else 0
+
+
+def resolve_main(argv: List[str]) -> int:
+    from .data import BibleBooks
+    from .stream import RECORDERS
+
+    ap = argparse.ArgumentParser(description="Resolve an edit list into a serialized verse stream.")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file.")
+    ap.add_argument("-d", "--debug", default=False, action="store_true",
+                    help="Include debug events (edit list lines) in the stream.")
+    ap.add_argument("-f", "--format", default="ndjson", choices=sorted(RECORDERS),
+                    help="Stream encoding.")
+    ap.add_argument("-o", "--output", default=None, type=str,
+                    help="Write the stream to this file (default: standard output).")
+    ap.add_argument("edit_list", type=str, metavar="EDITS_FILE", help="Reference edit list file.")
+    args = ap.parse_args(argv)
+
+    bb = BibleBooks.fromfile(args.bible_file or BIBLE_FILE)
+    recorder = RECORDERS[args.format]()
+    if args.output:
+        mode = "wb" if args.format == "binary" else "wt"
+        with open(args.output, mode, **({} if mode == "wb" else {"encoding": "utf8"})) as out:
+            render_file(args.edit_list, bb, recorder, out, debug=args.debug)
+    else:
+        render_file(args.edit_list, bb, recorder, sys.stdout, debug=args.debug)
+    return 0
+
+
+def typeset_main(argv: List[str]) -> int:
+    from .stream import read_events, replay
+
+    ap = argparse.ArgumentParser(description="Typeset a serialized verse stream (NDJSON or binary, auto-detected).")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file (for reference continuity and book names).")
+    ap.add_argument("-i", "--input", default=None, type=str,
+                    help="Read the stream from this file (default: standard input).")
+    ap.add_argument("-o", "--output", default=None, type=str,
+                    help="Write output to this file (default: standard output).")
+    ap.add_argument("typesetter", metavar="TYPESETTER", help=TYPESETTER_HELP)
+    ap.add_argument("typesetter_args", nargs=argparse.REMAINDER, metavar="...",
+                    help="Arguments for the typesetter (everything after its name).")
+    args = ap.parse_args(argv)
+    extra_argv = args.typesetter_args
+
+    bb = LazyBibleBooks(args.bible_file or BIBLE_FILE)
+    tts = new_typesetter(ap, args.typesetter, extra_argv, bb)
+
+    source = open(args.input, "rb") if args.input else sys.stdin.buffer
+    out = open(args.output, "wt", encoding="utf8") if args.output else sys.stdout
+    try:
+        replay(read_events(source), tts, out)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def serve_main(argv: List[str]) -> int:
+    import asyncio
+    from .server import RenderServer
+
+    ap = argparse.ArgumentParser(description="Serve edit list renders over HTTP (GET /<edit-list>/<typesetter>?arg=...).")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file.")
+    ap.add_argument("-e", "--edits-dir", default=".", type=str,
+                    help="Directory of the edit lists to serve.")
+    ap.add_argument("-j", "--jobs", default=None, type=int,
+                    help="Number of render worker processes (default: one per CPU).")
+    ap.add_argument("-H", "--host", default="127.0.0.1", type=str, help="Address to listen on.")
+    ap.add_argument("-p", "--port", default=8088, type=int, help="Port to listen on.")
+    args = ap.parse_args(argv)
+
+    server = RenderServer(args.edits_dir, args.bible_file or BIBLE_FILE, args.jobs)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def where_main(argv: List[str]) -> int:
+    from .data import BibleBooks
+    from .where import EditListIndex
+
+    ap = argparse.ArgumentParser(description="Find the edit list lines that include given verses/passages.")
+    ap.add_argument("-b", "--bible-file", default=None, type=str,
+                    help="Bible verse database file.")
+    ap.add_argument("-x", "--overlap", default=None, type=str, metavar="OTHER_EDITS",
+                    help="Report lines of EDITS_FILE sharing verses with lines of this edit list.")
+    ap.add_argument("edit_list", type=str, metavar="EDITS_FILE", help="Reference edit list file.")
+    ap.add_argument("refs", nargs="*", metavar="REF", help="References to look up (e.g., 'Joh 3:16' or 'Gen 1:1-3:5').")
+    args = ap.parse_args(argv)
+    if not args.refs and not args.overlap:
+        ap.error("give at least one REF and/or --overlap")
+
+    def fail(what: str, e: Exception):
+        # (unknown verses surface as KeyErrors with the VerseRef, bad syntax as SyntaxErrors)
+        ref = e.args[0] if e.args else e
+        if isinstance(ref, VerseRef):
+            ap.error(f"{what}: unknown verse {ref.book} {ref.chapter}:{ref.verse}")
+        ap.error(f"{what}: {ref}")
+
+    bb = BibleBooks.fromfile(args.bible_file or BIBLE_FILE)
+    edit_lists = [args.edit_list] + ([args.overlap] if args.overlap else [])
+    indexes = []
+    for edit_list in edit_lists:
+        try:
+            indexes.append(EditListIndex.fromfile(edit_list, bb))
+        except (KeyError, SyntaxError) as e:
+            fail(f"in edit list '{edit_list}'", e)
+    index = indexes[0]
+    found = False
+    for ref in args.refs:
+        try:
+            entries = index.query(ref)
+        except (KeyError, SyntaxError) as e:
+            fail(f"invalid reference '{ref}'", e)
+        for e in entries:
+            print(f"{ref}: {e.source}:{e.line}: {e.text}")
+            found = True
+    if args.overlap:
+        for mine, theirs in index.overlaps(indexes[1]):
+            print(f"{mine.source}:{mine.line}: {mine.text}  <->  {theirs.source}:{theirs.line}: {theirs.text}")
+            found = True
+    return 0 if found else 1
+
+
+COMMANDS = {
+    "render": render_main,
+    "batch": batch_main,
+    "resolve": resolve_main,
+    "typeset": typeset_main,
+    "serve": serve_main,
+    "where": where_main,
+}
+
+
+def main(argv: List[str]) -> int:
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    return render_main(argv)
+
+
+sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,154 @@
+'''Rendering many edit lists/typesetter combinations in one process (pool).
+
+A batch is a list of `Job`s, built either from a manifest file (one job per line:
+`EDITS_FILE OUTPUT_FILE TYPESETTER [TYPESETTER_ARGS...]`, shell-quoted, "#" comments)
+or from edit-list globs crossed with target specs (`TYPESETTER [TYPESETTER_ARGS...]`).
+
+Each worker process parses the Bible only once (workers forked after the parent has
+loaded it simply inherit it), and failures are reported per job rather than aborting the batch.
+'''
+import glob
+import os
+import shlex
+import time
+import traceback
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional
+
+from .data import BibleBooks
+from .render import render_file
+from .ts import Typesetter
+
+Job = namedtuple("Job", ("edit_list", "output", "typesetter", "argv"))
+JobResult = namedtuple("JobResult", ("job", "ok", "seconds", "error"))
+
+# per-process cache of loaded Bibles (filename -> BibleBooks)
+_BIBLES = {}
+
+
+def get_bible(filename: str) -> BibleBooks:
+    '''Return the (per-process, cached) BibleBooks for <filename>.'''
+    try:
+        return _BIBLES[filename]
+    except KeyError:
+        bb = _BIBLES[filename] = BibleBooks.fromfile(filename)
+        return bb
+
+
+def parse_manifest(lines: Iterable[str]) -> List[Job]:
+    '''Parse batch manifest <lines> into Jobs.
+
+    Raises a SyntaxError for lines with fewer than 3 fields (or unbalanced quotes).
+    '''
+    jobs = []
+    for i, line in enumerate(lines):
+        try:
+            fields = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise SyntaxError(f"manifest line {i+1}: {e}")
+        if not fields:
+            continue
+        if len(fields) < 3:
+            raise SyntaxError(f"manifest line {i+1}: expected 'EDITS_FILE OUTPUT_FILE TYPESETTER [ARGS...]'")
+        jobs.append(Job(fields[0], fields[1], fields[2], fields[3:]))
+    return jobs
+
+
+def glob_jobs(patterns: Iterable[str], targets: Iterable[str], out_dir: str) -> List[Job]:
+    '''Return a Job for each (edit list matching one of <patterns>, target spec in <targets>) pair.
+
+    Outputs are named `<out_dir>/<edit-list-stem>.<typesetter>[-<n>]<extension>`
+    (the "-<n>" suffix distinguishes repeated typesetter names among <targets>).
+    Edit lists sharing a stem (e.g., `d1/x.edits` and `d2/x.edits`) are told apart by their
+    paths relative to their common directory instead (`<out_dir>/d1/x...`, `<out_dir>/d2/x...`).
+    Unknown typesetters are left for `run_job` to report (as failed jobs).
+    '''
+    specs = [shlex.split(t) for t in targets]
+    names = [spec[0] for spec in specs]
+    labels = []
+    for i, name in enumerate(names):
+        if names.count(name) == 1:
+            labels.append(name)
+        else:
+            labels.append(f"{name}-{names[:i].count(name) + 1}")
+
+    edit_lists = {}
+    for pattern in patterns:
+        for edit_list in sorted(glob.glob(pattern)):
+            edit_lists.setdefault(os.path.realpath(edit_list), edit_list)
+
+    by_stem = defaultdict(list)
+    for real in edit_lists:
+        by_stem[os.path.splitext(os.path.basename(real))[0]].append(real)
+    out_names = {}
+    for stem, reals in by_stem.items():
+        if len(reals) == 1:
+            out_names[reals[0]] = stem
+        else:
+            base = os.path.commonpath([os.path.dirname(r) for r in reals])
+            for real in reals:
+                out_names[real] = os.path.relpath(os.path.splitext(real)[0], base)
+
+    jobs = []
+    for real, edit_list in edit_lists.items():
+        for spec, label in zip(specs, labels):
+            try:
+                ext = Typesetter.get_class(spec[0]).file_extension
+            except KeyError:
+                ext = Typesetter.file_extension
+            jobs.append(Job(edit_list, os.path.join(out_dir, f"{out_names[real]}.{label}{ext}"), spec[0], spec[1:]))
+    return jobs
+
+
+def run_job(job: Job, bible_file: str) -> JobResult:
+    '''Render a single Job (never raises; failures are reported in the JobResult).'''
+    t0 = time.perf_counter()
+    try:
+        bb = get_bible(bible_file)
+        tts = Typesetter.new(job.typesetter, job.argv, bb)
+        out_dir = os.path.dirname(job.output)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(job.output, "wt", encoding="utf8") as out:
+            try:
+                render_file(job.edit_list, bb, tts, out)
+            except BaseException:
+                out.close()
+                os.remove(job.output) # don't leave partial output behind
+                raise
+    except SystemExit as e:
+        # (typesetters exit via argparse on bad arguments)
+        return JobResult(job, False, time.perf_counter() - t0, f"typesetter exited (status {e.code})")
+    except Exception as e:
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return JobResult(job, False, time.perf_counter() - t0, error)
+    return JobResult(job, True, time.perf_counter() - t0, None)
+
+
+def run_batch(jobs: List[Job], bible_file: str, workers: Optional[int] = None) -> Iterator[JobResult]:
+    '''Run <jobs> over a pool of <workers> processes (default: one per CPU), yielding results as they complete.
+
+    With workers=1, jobs run sequentially in this process.  Jobs sharing an output file
+    are reported as failed without being run.
+    '''
+    # jobs writing the same output file would race (and silently lose output): fail them all
+    outputs = Counter(os.path.realpath(job.output) for job in jobs)
+    runnable = []
+    for job in jobs:
+        if outputs[os.path.realpath(job.output)] > 1:
+            yield JobResult(job, False, 0.0, f"output file '{job.output}' is also written by another job")
+        else:
+            runnable.append(job)
+    jobs = runnable
+
+    # load in the parent first, so forked workers inherit the parsed Bible
+    get_bible(bible_file)
+    if workers == 1:
+        for job in jobs:
+            yield run_job(job, bible_file)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, job, bible_file) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,135 @@
+'''Content-addressed, size-bounded on-disk cache of rendered CLI output.
+
+Keys are hashes of everything a render depends on: the Bible file, the edit list,
+the typesetter name and arguments, the typesetter's extra input files (preludes,
+stylesheets; see `Typesetter.cache_inputs`) and the tgntools source files involved.
+All of these are hashed by content, except the (large) Bible file, which is identified
+by its path, size and mtime, so cache hits don't have to read it.
+Entries are evicted least-recently-used first (by file mtime, refreshed on every hit)
+whenever the cache grows past its size limit.
+'''
+import hashlib
+import inspect
+import os
+import tempfile
+from typing import Iterable, List, Optional
+
+from .tokens import file_stamp
+from .ts import Typesetter
+
+# bump to invalidate all existing cache entries (e.g., if the key recipe changes)
+CACHE_FORMAT = "tgn-render-cache-2"
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+ENTRY_SUFFIX = ".out"
+
+_tgntools_dir = os.path.dirname(__file__)
+_CORE_SOURCES = [os.path.join(_tgntools_dir, name) for name in ("data.py", "refs.py", "render.py")]
+
+
+def file_digest(filename: str) -> str:
+    '''Return the SHA-256 hex digest of file <filename> (or "missing" if it can't be read).'''
+    h = hashlib.sha256()
+    try:
+        with open(filename, "rb") as fd:
+            for block in iter(lambda: fd.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        return "missing"
+    return h.hexdigest()
+
+
+def stamp_id(filename: str) -> str:
+    '''Return an identifier of the current version of file <filename>: its path, size and mtime (or "missing").'''
+    try:
+        size, mtime = file_stamp(filename)
+    except OSError:
+        return "missing"
+    return f"{os.path.abspath(filename)}:{size}:{mtime}"
+
+
+def render_key(bible_file: str, edit_list: str, typesetter: str, argv: List[str],
+               tts: Typesetter, debug: bool = False) -> Optional[str]:
+    '''Return the cache key for rendering <edit_list> with typesetter <tts>.
+
+    Returns None if the typesetter's output isn't cacheable.
+    '''
+    inputs = tts.cache_inputs()
+    if inputs is None:
+        return None
+    sources = _CORE_SOURCES + [inspect.getfile(Typesetter), inspect.getfile(type(tts))]
+
+    h = hashlib.sha256()
+    def add(*parts: str):
+        for part in parts:
+            h.update(part.encode("utf8"))
+            h.update(b"\0")
+
+    add(CACHE_FORMAT, typesetter, str(len(argv)), *argv, str(debug))
+    add(stamp_id(bible_file), file_digest(edit_list), edit_list if debug else "")
+    for filename in inputs:
+        add(filename, file_digest(filename))
+    for filename in sources:
+        add(file_digest(filename))
+    return h.hexdigest()
+
+
+class RenderCache:
+    '''On-disk cache of rendered outputs (keyed by `render_key`), bounded to <max_bytes> total.
+    '''
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        '''Return the cached output for <key> (marking it recently used), or None.'''
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fd:
+                data = fd.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        '''Store output <data> under <key>, then evict old entries as needed.'''
+        os.makedirs(self.directory, exist_ok=True)
+        # write-then-rename, so concurrent readers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def _entries(self) -> Iterable[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [e for e in it if e.name.endswith(ENTRY_SUFFIX) and e.is_file()]
+        except OSError:
+            return []
+
+    def evict(self):
+        '''Delete least-recently-used entries until the cache fits in max_bytes.'''
+        entries = []
+        total = 0
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
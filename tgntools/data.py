@@ -1,11 +1,14 @@
 '''Tools for parsing/expanding machine-readable Bible databases.
 '''
 from __future__ import annotations
+import functools
 import os
 import re
 from collections import defaultdict, namedtuple
 from typing import Iterable, List, TextIO, Tuple
 
+from .tokens import TokenCorpus, file_stamp
+
 # Calculate the path to our default Bible
 # (unless overridden by ENVIRONMENT)
 _tgntools_dir = os.path.dirname(__file__)
@@ -13,6 +16,9 @@ _main_project_dir = os.path.join(_tgntools_dir, "..")
 _default_file = os.path.join(_main_project_dir, "data", "kjvdat.txt")
 BIBLE_FILE = os.environ.get("BIBLE_FILE", _default_file)
 
+# suffix of the token corpus cache file saved next to a Bible file (see `BibleBooks.fromfile`)
+TOKENS_SUFFIX = ".tokens"
+
 
 # Simple types and compiled regexen
 ###################################
@@ -191,10 +197,23 @@ class BibleBooks:
     '''Load/access book spans from a Bible verse database.
     
     Uses the `kjvdat.txt` file format described in `README.md`.
+
+    Verse texts are stored in database order, so contiguous spans can be fetched as
+    a single slice (`get_range`).  With a non-zero <cache_size>, lookups go through a
+    bounded LRU cache (see `cache_info` for hit/miss counters); this only pays off
+    when fetching a text is more expensive than a dict lookup (e.g., for compact or
+    memory-mapped backends that decode on access), so it is disabled by default.
+
+    Word-level access goes through a pre-tokenized corpus (see `tokens.py` and `tokens`),
+    built on first use, or loaded from (and saved to) a cache file next to the Bible file
+    by `fromfile(..., tokenize=True)`.
     '''
-    def __init__(self, stream: TextIO):
-        self._verses = {}
+    def __init__(self, stream: TextIO, cache_size: int = 0):
+        self._refs = []
+        self._texts = []
+        self._index = {}
         self._books = {}
+        self._corpus = None
 
         cur_book = None
         max_verses = {}
@@ -202,7 +221,10 @@ class BibleBooks:
         last_verse = None
         for line in stream:
             book, chapter, verse, text = parse_verse_line(line)
-            self._verses[VerseRef(book, chapter, verse)] = text
+            ref = VerseRef(book, chapter, verse)
+            self._index[ref] = len(self._refs)
+            self._refs.append(ref)
+            self._texts.append(text)
             
             if chapter != cur_chapter:
                 if cur_chapter:
@@ -218,10 +240,60 @@ class BibleBooks:
         max_verses[chapter] = last_verse
         self._books[book] = max_verses
 
+        self._cached = bool(cache_size)
+        if self._cached:
+            self._fetch = functools.lru_cache(maxsize=cache_size)(self._fetch)
+
     @staticmethod
-    def fromfile(filename: str = BIBLE_FILE) -> BibleBooks:
+    def fromfile(filename: str = BIBLE_FILE, cache_size: int = 0, tokenize: bool = False) -> BibleBooks:
         with open(filename, "rt", encoding="utf8") as fd:
-            return BibleBooks(fd)
+            bb = BibleBooks(fd, cache_size=cache_size)
+        if tokenize:
+            bb.load_tokens(filename + TOKENS_SUFFIX, file_stamp(filename))
+        return bb
+
+    def load_tokens(self, cache_file: str, stamp: Tuple[int, int]):
+        '''Load the token corpus from <cache_file> if it was saved there for source file <stamp>;
+        otherwise build it and (if possible) save it there.
+        '''
+        corpus = TokenCorpus.load(cache_file, stamp)
+        if corpus is None or len(corpus) != len(self._texts):
+            corpus = TokenCorpus.build(self._texts)
+            try:
+                corpus.save(cache_file, stamp)
+            except OSError:
+                pass # (a read-only data directory just means re-tokenizing next time)
+        self._corpus = corpus
+
+    @property
+    def tokenized(self) -> bool:
+        '''True if the token corpus is already available (i.e., word-level access is cheap).'''
+        return self._corpus is not None
+
+    @property
+    def corpus(self) -> TokenCorpus:
+        '''The token corpus (positions are database ordinals); built on first access if not loaded.'''
+        if self._corpus is None:
+            self._corpus = TokenCorpus.build(self._texts)
+        return self._corpus
+
+    def tokens(self, ref: VerseRef) -> List[str]:
+        '''Return the (whitespace-separated) words of verse <ref>.
+
+        Raises a KeyError for unknown references.
+        '''
+        return self.corpus.tokens(self._index[ref])
+
+    def word_count(self, ref: VerseRef) -> int:
+        return self.corpus.word_count(self._index[ref])
+
+    def textwrap_safe(self, ref: VerseRef, text: str) -> bool:
+        '''True if <text> is verse <ref>'s own text, and its tokens are exactly the words `textwrap` would see.
+
+        Raises a KeyError for unknown references.
+        '''
+        i = self._index[ref]
+        return self.corpus.textwrap_safe(i) and text == self._texts[i]
     
     def last_chapter(self, book: str) -> int:
         return max(self._books[book])
@@ -263,6 +335,63 @@ class BibleBooks:
     def pretty_names(self, short: bool = False) -> Iterable[Tuple[str, str]]:
         return list(BOOK_NAMES.items()) if not short else list(SHORT_BOOK_NAMES.items())
 
+    def _fetch(self, first: int, last: int) -> Tuple[str, ...]:
+        # the (optionally LRU-cached) text access point, by database position
+        return tuple(self._texts[first : last + 1])
+
+    def ordinal(self, ref: VerseRef) -> int:
+        '''Return the position of <ref> in the database (contiguous verses have consecutive ordinals).
+
+        Raises a KeyError for unknown references.
+        '''
+        return self._index[ref]
+
+    def refs_between(self, start: VerseRef, end: VerseRef) -> List[VerseRef]:
+        '''Return all references from <start> through <end> (inclusive, in database order).'''
+        return self._refs[self._index[start] : self._index[end] + 1]
+
+    def get_range(self, start: VerseRef, end: VerseRef) -> List[str]:
+        '''Return the texts of all verses from <start> through <end> (inclusive, in database order).
+
+        Raises a KeyError for unknown references and a ValueError if <end> precedes <start>.
+        '''
+        first = self._index[start]
+        last = self._index[end]
+        if last < first:
+            raise ValueError(f"{end} precedes {start}")
+        return list(self._fetch(first, last))
+
+    def cache_info(self):
+        '''Return the LRU cache's (hits, misses, maxsize, currsize) counters (None if caching is disabled).'''
+        info = getattr(self._fetch, "cache_info", None)
+        return info() if info else None
+
     def __getitem__(self, ref: VerseRef) -> str:
-        return self._verses[ref]
+        i = self._index[ref]
+        if self._cached:
+            return self._fetch(i, i)[0]
+        return self._texts[i]
+
 
+class LazyBibleBooks:
+    '''Stand-in for a BibleBooks that parses its file only when first used.
+
+    Lets the CLI construct typesetters (and check its render cache) without paying for
+    parsing the Bible when the output can be served from the cache.
+    '''
+    def __init__(self, filename: str = BIBLE_FILE, cache_size: int = 0, tokenize: bool = False):
+        self.filename = filename
+        self._cache_size = cache_size
+        self._tokenize = tokenize
+        self._bb = None
+
+    def load(self) -> BibleBooks:
+        if self._bb is None:
+            self._bb = BibleBooks.fromfile(self.filename, cache_size=self._cache_size, tokenize=self._tokenize)
+        return self._bb
+
+    def __getattr__(self, name: str):
+        return getattr(self.load(), name)
+
+    def __getitem__(self, ref: VerseRef) -> str:
+        return self.load()[ref]
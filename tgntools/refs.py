@@ -2,7 +2,7 @@
 '''
 import re
 from collections import namedtuple
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional, Tuple
 
 from .data import BibleBooks, VerseRef
 
@@ -10,8 +10,19 @@ from .data import BibleBooks, VerseRef
 RX_WS = re.compile(r"\s*")
 RX_NAME = re.compile(r"([A-Za-z][A-Za-z0-9]*)\s+")
 RX_NUM = re.compile(r"([0-9]+)\s*")
+# whole clauses, so spans take one match each: "c:v", and ",v" / "-v" / "-c:v" / ";"
+RX_CHAP_VERSE = re.compile(r"([0-9]+)\s*:\s*([0-9]+)\s*")
+RX_ITEM = re.compile(r",\s*([0-9]+)\s*|-\s*([0-9]+)\s*(?::\s*([0-9]+)\s*)?|;\s*")
 
-BB = BibleBooks.fromfile()
+# default Bible database, loaded only on first use (parsing it dominates CLI startup time)
+_default_bb = None
+
+
+def default_bible() -> BibleBooks:
+    global _default_bb
+    if _default_bb is None:
+        _default_bb = BibleBooks.fromfile()
+    return _default_bb
 
 
 class ParseStream:
@@ -34,6 +45,12 @@ class ParseStream:
         else:
             return None
 
+    def match(self, pat) -> Optional[re.Match]:
+        m = pat.match(self._s, pos=self._pos)
+        if m:
+            self._pos = m.end()
+        return m
+
     def eat_ws(self):
         self.eat(RX_WS)
 
@@ -64,39 +81,89 @@ class ParseStream:
             return False
 
 
-def parse_ref(ref: str, bb: BibleBooks = BB) -> Iterable[VerseRef]:
+def _parse_spans(ref: str) -> Iterator[Tuple[VerseRef, VerseRef]]:
+    # yield the (start, end) spans as written: single verses, and "v-v"/"c:v-c:v" ranges
+    # (each range is one span by construction, so verses are never enumerated here)
     ps = ParseStream(ref)
     book = None
     while not ps.eos():
         if not book:
             book = ps.read_name()
-        chap = ps.read_num()
-        ps.require(":")
-        verse = ps.read_num()
-        
-        yield VerseRef(book, chap, verse)
+        m = ps.match(RX_CHAP_VERSE)
+        if m is None:
+            # (re-parse piecewise for a specific error)
+            ps.read_num()
+            ps.require(":")
+            ps.read_num()
+        chap = int(m.group(1))
+        start = end = VerseRef(book, chap, int(m.group(2)))
 
         while not ps.eos():
-            if ps.accept(","):
-                verse = ps.read_num()
-                yield VerseRef(book, chap, verse)
-            elif ps.accept("-"):
-                end_span = ps.read_num()
-                if ps.accept(":"):
-                    for cnum in range(chap, end_span):
-                        last_verse = bb.last_verse(book, cnum)
-                        for vnum in range(verse + 1, last_verse + 1):
-                            yield VerseRef(book, cnum, vnum)
-                        verse = 0
-                    end_verse = ps.read_num()
-                    chap = end_span
+            m = ps.match(RX_ITEM)
+            if m is None:
+                if ps.peek() in (",", "-"):
+                    raise SyntaxError("expected number")
+                raise SyntaxError(f"unexpected '{ps.peek()}'")
+            verse, end_span, end_verse = m.groups()
+            if verse is not None:
+                yield (start, end)
+                start = end = VerseRef(book, chap, int(verse))
+            elif end_span is not None:
+                if end_verse is not None:
+                    chap = int(end_span)
+                    end = VerseRef(book, chap, int(end_verse))
                 else:
-                    end_verse = end_span
-
-                for vnum in range(verse+1, end_verse+1):
-                    yield VerseRef(book, chap, vnum)
-            elif ps.accept(";"):
-                break
+                    end = VerseRef(book, chap, int(end_span))
+                if (end.chapter, end.verse) < (start.chapter, start.verse):
+                    end = start # (backwards ranges are empty beyond their start)
             else:
-                raise SyntaxError(f"unexpected '{ps.peek()}'")
-
+                break # ";"
+        yield (start, end)
+
+
+def parse_ref(ref: str, bb: Optional[BibleBooks] = None) -> Iterable[VerseRef]:
+    '''Yield every verse of reference string <ref> (e.g., "Gen 1:1-3,5; 2:1-3:4"), in order.
+
+    (<bb> supplies chapter lengths for ranges spanning chapters.)
+    '''
+    for start, end in _parse_spans(ref):
+        book = start.book
+        verse = start.verse
+        for chap in range(start.chapter, end.chapter):
+            if bb is None:
+                bb = default_bible()
+            for vnum in range(verse, bb.last_verse(book, chap) + 1):
+                yield VerseRef(book, chap, vnum)
+            verse = 1
+        for vnum in range(verse, end.verse + 1):
+            yield VerseRef(book, end.chapter, vnum)
+
+
+def parse_ref_spans(ref: str, bb: Optional[BibleBooks] = None) -> Iterable[Tuple[VerseRef, VerseRef]]:
+    '''Like `parse_ref`, but yield (start, end) pairs of maximal contiguous spans of verses.
+
+    Ranges are parsed directly into spans (their verses are not enumerated); consecutive spans
+    that are adjacent in <bb> (e.g., "Gen 2:4,5") are merged.  Spans with references unknown
+    to <bb> are yielded unmerged.
+    '''
+    if bb is None:
+        bb = default_bible()
+    ordinal = bb.ordinal
+    span = None
+    span_end_ord = None
+    for start, end in _parse_spans(ref):
+        try:
+            start_ord = ordinal(start)
+            end_ord = start_ord if end is start else ordinal(end)
+        except KeyError:
+            start_ord = end_ord = None
+        if span is not None and span_end_ord is not None and start_ord == span_end_ord + 1:
+            span = (span[0], end)
+            span_end_ord = end_ord
+            continue
+        if span is not None:
+            yield span
+        span = (start, end)
+        span_end_ord = end_ord
+    if span is not None:
+        yield span
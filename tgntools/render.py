@@ -0,0 +1,61 @@
+'''Driving a Typesetter from an edit list.
+'''
+from typing import IO, Iterable
+
+from .refs import parse_ref_spans
+from .data import BibleBooks
+from .ts import Typesetter
+
+
+def render(lines: Iterable[str], bb: BibleBooks, tts: Typesetter, stream: IO,
+           debug: bool = False, source_name: str = "<edits>"):
+    '''Typeset the edit list <lines> (with verse text from <bb>) onto <stream> using <tts>.
+
+    Comment lines (starting with "#") are skipped, except that the first comment line of
+    each comment block titles the following section (see `Typesetter.section`); any other
+    line that yields no verses (e.g., a blank line) produces a paragraph break.
+    '''
+    tts.start(stream)
+    emitted_para_break = False
+    in_comment_block = False
+    section_title = None
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if debug:
+            tts.debug(f"{source_name}:{i+1}: {line}")
+        if line.startswith("#"):
+            # the first (non-empty) comment line of each comment block titles the following section
+            title = line.lstrip("#").strip()
+            if title and not in_comment_block:
+                section_title = title
+                in_comment_block = True
+            continue
+        in_comment_block = False
+
+        emitted_verse = False
+        for start, end in parse_ref_spans(line, bb):
+            if section_title is not None:
+                tts.section(section_title)
+                section_title = None
+            if start == end:
+                tts.feed(start, bb[start])
+            else:
+                tts.feed_range(bb.refs_between(start, end), bb.get_range(start, end))
+            emitted_verse = True
+            emitted_para_break = False
+
+        # emit a paragraph break if we encountered a non-comment, non-verse line
+        # (but only once, until after we've seen more verses)
+        if not emitted_verse:
+            if not emitted_para_break:
+                tts.paragraph()
+                emitted_para_break = True
+
+    tts.finish()
+
+
+def render_file(edit_list: str, bb: BibleBooks, tts: Typesetter, stream: IO, debug: bool = False):
+    '''Typeset the edit list file <edit_list> onto <stream> (see `render`).
+    '''
+    with open(edit_list, "rt", encoding="utf8") as fd:
+        render(fd, bb, tts, stream, debug=debug, source_name=edit_list)
@@ -0,0 +1,213 @@
+'''Asyncio HTTP rendering server.
+
+Serves `GET /<edit-list-name>/<typesetter>[?arg=...&arg=...]`, rendering the named edit list
+(from the server's edits directory) with the named typesetter (and its CLI arguments, one per
+"arg" query parameter).  Only HTTP/1.0-style, one request per connection, is supported.
+
+* rendering is CPU-bound, so it runs in a process pool (each worker parses the Bible once)
+* identical requests arriving while a render is in flight share that render's result
+  (request coalescing), so a burst of clients asking for the same narrative costs one render
+* responses are streamed in blocks, waiting for each block to drain before writing the next,
+  so slow clients don't make the server buffer whole documents per connection
+
+Clients may only pass the typesetter options listed in `SAFE_ARGS`: options naming files or
+directories (preludes, style sheets, chunk/page directories) would let any client read or
+write files on the server.  Numeric option values are bounded too, as plain text laid out
+in (nearly) zero-width columns costs a line per character.
+'''
+import asyncio
+import io
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .batch import get_bible
+from .render import render_file
+from .ts import Typesetter
+
+BLOCK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+}
+
+
+# typesetter name -> {long option clients may pass (as exact tokens, "--long-option=VALUE", or the
+#                     short form in `SHORT_OPTIONS`): (min, max) value of integer options, or None for flags}
+SAFE_ARGS = {
+    "plain": {"--max-column": (40, 200), "--verse-column": (0, 180)},
+    "html5": {"--compact": None},
+    "sile": {"--page-refs": None},
+}
+SHORT_OPTIONS = {"-m": "--max-column", "-v": "--verse-column", "-C": "--compact", "-r": "--page-refs"}
+
+# minimum text width (max column - verse column) of plain output
+MIN_TEXT_WIDTH = 20
+
+
+class RenderError(Exception):
+    '''A render request that can't be satisfied (reported to the client as a 400 response).'''
+    pass
+
+
+def render_bytes(edit_list: str, typesetter: str, argv: List[str], bible_file: str) -> bytes:
+    '''Render <edit_list> with <typesetter> and return the (UTF-8) output (runs in pool workers).
+
+    Raises a RenderError for unknown typesetters, bad typesetter arguments,
+    or typesetter modes that write files other than their output.
+    '''
+    bb = get_bible(bible_file)
+    try:
+        tts = Typesetter.new(typesetter, argv, bb)
+    except KeyError as e:
+        raise RenderError(e.args[0])
+    except SystemExit:
+        raise RenderError(f"bad arguments for typesetter '{typesetter}'")
+    if tts.cache_inputs() is None:
+        raise RenderError("typesetter options that write extra files are not supported")
+    out = io.StringIO()
+    render_file(edit_list, bb, tts, out)
+    return out.getvalue().encode("utf8")
+
+
+def check_args(typesetter: str, argv: List[str]):
+    '''Raise a RenderError unless all options in <argv> (and their values) are allowed for <typesetter>
+    (see `SAFE_ARGS`).
+
+    (Exact tokens only, so neither abbreviated long options nor combined short options get through.)
+    '''
+    allowed = SAFE_ARGS.get(typesetter, {})
+    values = {}
+    args = iter(argv)
+    for arg in args:
+        option, eq, value = arg.partition("=") if arg.startswith("--") else (SHORT_OPTIONS.get(arg, arg), "", "")
+        if option not in allowed:
+            raise RenderError(f"typesetter option '{arg}' is not allowed")
+        bounds = allowed[option]
+        given = option if eq else arg
+        if bounds is None:
+            if eq:
+                raise RenderError(f"typesetter option '{given}' takes no value")
+            continue
+        if not eq:
+            value = next(args, "")
+        lo, hi = bounds
+        if not (value.isdecimal() and len(value) <= 9 and lo <= int(value) <= hi):
+            raise RenderError(f"typesetter option '{given}' needs an integer from {lo} to {hi}")
+        values[option] = int(value)
+
+    if typesetter == "plain":
+        max_column = values.get("--max-column", 100)
+        verse_column = values.get("--verse-column")
+        if verse_column is not None and max_column - verse_column < MIN_TEXT_WIDTH:
+            raise RenderError(f"the verse column must be at least {MIN_TEXT_WIDTH} less than the max column")
+
+
+def _warm_up(bible_file: str):
+    get_bible(bible_file) # (without shipping it back to the parent)
+
+
+class RenderServer:
+    '''Serves renders of the edit lists in <edits_dir> (see module docs).
+    '''
+    def __init__(self, edits_dir: str, bible_file: str, workers: Optional[int] = None):
+        self.edits_dir = edits_dir
+        self.bible_file = bible_file
+        self._workers = workers
+        self._pool = None
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.renders = 0    # renders actually performed
+        self.requests = 0   # render requests served (incl. coalesced ones)
+
+    async def render(self, name: str, typesetter: str, argv: List[str]) -> bytes:
+        '''Return the rendered output, sharing any identical in-flight render.'''
+        if "/" in name or "\\" in name or name.startswith("."):
+            raise RenderError(f"invalid edit list name '{name}'")
+        edit_list = os.path.join(self.edits_dir, name)
+        try:
+            mtime = os.stat(edit_list).st_mtime_ns
+        except OSError:
+            raise RenderError(f"no such edit list '{name}'")
+
+        check_args(typesetter, argv)
+
+        self.requests += 1
+        key = (edit_list, mtime, typesetter, tuple(argv))
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, render_bytes, edit_list, typesetter, argv, self.bible_file)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.renders += 1
+        # (shield: one client going away mustn't cancel the render for the others)
+        return await asyncio.shield(future)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass # (headers are ignored)
+
+            if len(request_line) < 2:
+                return await self._respond(writer, 400, b"bad request\n")
+            method, target = request_line[0], request_line[1]
+            if method != "GET":
+                return await self._respond(writer, 405, b"only GET is supported\n")
+
+            url = urlsplit(target)
+            parts = [unquote(p) for p in url.path.strip("/").split("/")]
+            if len(parts) != 2:
+                return await self._respond(writer, 404, b"expected /<edit-list>/<typesetter>\n")
+            name, typesetter = parts
+            argv = parse_qs(url.query).get("arg", [])
+
+            try:
+                body = await self.render(name, typesetter, argv)
+            except RenderError as e:
+                return await self._respond(writer, 400, f"{e}\n".encode("utf8"))
+            except Exception:
+                # (details stay in the server's log: they may include paths and file contents)
+                traceback.print_exc(file=sys.stderr)
+                return await self._respond(writer, 500, b"render failed\n")
+
+            try:
+                ext = Typesetter.get_class(typesetter).file_extension
+            except KeyError:
+                ext = ".txt"
+            await self._respond(writer, 200, body, CONTENT_TYPES.get(ext, "text/plain; charset=utf-8"))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+                       content_type: str = "text/plain; charset=utf-8"):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+        writer.write((f"HTTP/1.0 {status} {reasons[status]}\r\n"
+                      f"Content-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      "Connection: close\r\n\r\n").encode("latin-1"))
+        # stream the body, respecting the transport's flow control
+        view = memoryview(body)
+        for i in range(0, len(body), BLOCK_SIZE):
+            writer.write(view[i : i + BLOCK_SIZE])
+            await writer.drain()
+        await writer.drain()
+
+    async def serve(self, host: str, port: int):
+        # parse the Bible in the parent first, so forked workers inherit it
+        get_bible(self.bible_file)
+        workers = self._workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            self._pool = pool
+            # start all the workers before accepting connections
+            # (workers forked later would inherit, and hold open, client sockets)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(pool, _warm_up, self.bible_file) for _ in range(workers)])
+            server = await asyncio.start_server(self.handle, host, port)
+            async with server:
+                await server.serve_forever()
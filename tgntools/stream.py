@@ -0,0 +1,218 @@
+'''Serialized verse streams: the resolved form of an edit list, between parsing and typesetting.
+
+A verse stream is a sequence of events, mirroring the Typesetter interface:
+
+* ("verse", VerseRef, text)
+* ("paragraph",)
+* ("section", title)
+* ("debug", message)
+
+Two encodings are supported:
+
+* NDJSON: one JSON object per line, e.g.
+  {"event": "verse", "book": "Gen", "chapter": 1, "verse": 1, "text": "In the beginning..."}
+* binary: the MAGIC header, then one record per event: event code (1 byte), payload length
+  (4 bytes, big-endian), payload.  Verse payloads are chapter and verse (2 bytes each),
+  book length (1 byte), book, text; other payloads are just their (UTF-8) string, if any.
+
+Streams are produced by the recorder "typesetters" below (see the `resolve` CLI command)
+and replayed into any real Typesetter with `replay` (see the `typeset` CLI command).
+'''
+import json
+import struct
+from typing import IO, BinaryIO, Iterable, Iterator, List, Tuple
+
+from .data import VerseRef
+from .ts import Typesetter
+
+VERSE = "verse"
+PARAGRAPH = "paragraph"
+SECTION = "section"
+DEBUG = "debug"
+
+MAGIC = b"TGNV\x01"
+
+_CODES = {VERSE: ord("V"), PARAGRAPH: ord("P"), SECTION: ord("S"), DEBUG: ord("D")}
+_EVENTS = {code: event for event, code in _CODES.items()}
+
+_RECORD_HEADER = struct.Struct(">BI")
+_VERSE_HEADER = struct.Struct(">HHB")
+
+Event = Tuple
+
+
+class _Recorder:
+    '''Base of the stream-writing stand-ins for Typesetters (driven by `render.render`).
+    '''
+    def start(self, stream: IO):
+        raise NotImplementedError()
+
+    def write(self, event: Event):
+        raise NotImplementedError()
+
+    def debug(self, msg: str):
+        self.write((DEBUG, msg))
+
+    def paragraph(self):
+        self.write((PARAGRAPH,))
+
+    def section(self, title: str):
+        self.write((SECTION, title))
+
+    def feed(self, this: VerseRef, text: str):
+        self.write((VERSE, this, text))
+
+    def feed_range(self, refs: List[VerseRef], texts: List[str]):
+        for this, text in zip(refs, texts):
+            self.write((VERSE, this, text))
+
+    def finish(self):
+        self._out.flush()
+
+
+class NdjsonRecorder(_Recorder):
+    '''Records events as NDJSON onto a text stream.
+    '''
+    def start(self, stream: IO):
+        self._out = stream
+
+    def write(self, event: Event):
+        self._out.write(encode_ndjson(event) + "\n")
+
+
+class BinaryRecorder(_Recorder):
+    '''Records events in the binary encoding onto a byte stream (or the binary buffer of a text stream).
+    '''
+    def start(self, stream: IO):
+        self._out = getattr(stream, "buffer", stream)
+        self._out.write(MAGIC)
+
+    def write(self, event: Event):
+        self._out.write(encode_binary(event))
+
+
+RECORDERS = {
+    "ndjson": NdjsonRecorder,
+    "binary": BinaryRecorder,
+}
+
+
+def encode_ndjson(event: Event) -> str:
+    kind = event[0]
+    if kind == VERSE:
+        vr, text = event[1], event[2]
+        obj = {"event": VERSE, "book": vr.book, "chapter": vr.chapter, "verse": vr.verse, "text": text}
+    elif kind == PARAGRAPH:
+        obj = {"event": PARAGRAPH}
+    elif kind == SECTION:
+        obj = {"event": SECTION, "title": event[1]}
+    elif kind == DEBUG:
+        obj = {"event": DEBUG, "message": event[1]}
+    else:
+        raise ValueError(f"unknown event '{kind}'")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def decode_ndjson(line: str) -> Event:
+    '''Parse one NDJSON line into an event.
+
+    Raises a SyntaxError for malformed or unknown records.
+    '''
+    try:
+        obj = json.loads(line)
+        kind = obj["event"]
+        if kind == VERSE:
+            return (VERSE, VerseRef(obj["book"], int(obj["chapter"]), int(obj["verse"])), obj["text"])
+        elif kind == PARAGRAPH:
+            return (PARAGRAPH,)
+        elif kind == SECTION:
+            return (SECTION, obj["title"])
+        elif kind == DEBUG:
+            return (DEBUG, obj["message"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise SyntaxError(f"invalid verse stream record '{line.strip()}'") from e
+    raise SyntaxError(f"unknown verse stream event '{kind}'")
+
+
+def encode_binary(event: Event) -> bytes:
+    kind = event[0]
+    if kind == VERSE:
+        vr, text = event[1], event[2]
+        book = vr.book.encode("utf8")
+        payload = _VERSE_HEADER.pack(vr.chapter, vr.verse, len(book)) + book + text.encode("utf8")
+    elif kind == PARAGRAPH:
+        payload = b""
+    elif kind in (SECTION, DEBUG):
+        payload = event[1].encode("utf8")
+    else:
+        raise ValueError(f"unknown event '{kind}'")
+    return _RECORD_HEADER.pack(_CODES[kind], len(payload)) + payload
+
+
+def read_ndjson(stream: Iterable[str]) -> Iterator[Event]:
+    for line in stream:
+        if line.strip():
+            yield decode_ndjson(line)
+
+
+def read_binary(stream: BinaryIO, check_magic: bool = True) -> Iterator[Event]:
+    '''Parse binary-encoded events from <stream>.
+
+    Raises a SyntaxError on a bad header or truncated/unknown records.
+    '''
+    if check_magic and stream.read(len(MAGIC)) != MAGIC:
+        raise SyntaxError("not a binary verse stream")
+    while True:
+        header = stream.read(_RECORD_HEADER.size)
+        if not header:
+            return
+        if len(header) < _RECORD_HEADER.size:
+            raise SyntaxError("truncated verse stream record")
+        code, size = _RECORD_HEADER.unpack(header)
+        payload = stream.read(size)
+        if len(payload) < size:
+            raise SyntaxError("truncated verse stream record")
+        kind = _EVENTS.get(code)
+        if kind == VERSE:
+            chapter, verse, book_len = _VERSE_HEADER.unpack_from(payload)
+            start = _VERSE_HEADER.size
+            book = payload[start:start + book_len].decode("utf8")
+            text = payload[start + book_len:].decode("utf8")
+            yield (VERSE, VerseRef(book, chapter, verse), text)
+        elif kind == PARAGRAPH:
+            yield (PARAGRAPH,)
+        elif kind in (SECTION, DEBUG):
+            yield (kind, payload.decode("utf8"))
+        else:
+            raise SyntaxError(f"unknown verse stream record code {code}")
+
+
+def read_events(stream: BinaryIO) -> Iterator[Event]:
+    '''Parse events from byte stream <stream>, auto-detecting its encoding (binary or NDJSON).'''
+    head = stream.read(len(MAGIC))
+    if head == MAGIC:
+        return read_binary(stream, check_magic=False)
+    return read_ndjson(_ndjson_lines(head, stream))
+
+
+def _ndjson_lines(head: bytes, stream: BinaryIO) -> Iterator[str]:
+    # re-attach the auto-detection bytes to the first line (before decoding, in case they split a character)
+    yield (head + stream.readline()).decode("utf8")
+    for line in stream:
+        yield line.decode("utf8")
+
+
+def replay(events: Iterable[Event], tts: Typesetter, stream: IO):
+    '''Typeset the verse stream <events> onto <stream> using <tts>.'''
+    tts.start(stream)
+    for event in events:
+        kind = event[0]
+        if kind == VERSE:
+            tts.feed(event[1], event[2])
+        elif kind == PARAGRAPH:
+            tts.paragraph()
+        elif kind == SECTION:
+            tts.section(event[1])
+        elif kind == DEBUG:
+            tts.debug(event[1])
+    tts.finish()
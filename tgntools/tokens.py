@@ -0,0 +1,143 @@
+'''Pre-tokenized verse corpus for word-level operations (counting, search, wrapping).
+
+Tokens are maximal runs of non-whitespace characters (so punctuation stays attached,
+as with `str.split()`).  The corpus stores, for all verses in database order:
+
+* an interned vocabulary (each distinct token string once, in first-seen order)
+* the token ids of every verse, concatenated into one compact array
+* each token's character offset within its verse's text
+* per-verse start positions into those arrays
+* per-verse "textwrap-safe" flags (see `TokenCorpus.textwrap_safe`)
+
+The corpus can be saved to/loaded from a binary file, so it is computed only once per
+Bible file.  Ids and offsets are stored as 2-byte integers where they fit (they do for
+typical Bibles: fewer than 65536 distinct tokens, and verses shorter than 65536 characters).
+'''
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+RX_TOKEN = re.compile(r"\S+")
+
+MAGIC = b"TGNT\x02"
+
+# (source stamp: size, mtime_ns), vocabulary byte length, token count, verse count,
+# array typecodes of the ids and offsets, byte order
+_HEADER = struct.Struct(">QQIII2sc")
+
+
+def _narrow(a: array) -> array:
+    # 2-byte copy of unsigned int array <a>, if all its values fit
+    return array("H", a) if max(a, default=0) < 0x10000 else a
+
+
+class TokenCorpus:
+    '''Token ids/offsets for a sequence of verse texts (addressed by database position).
+    '''
+    def __init__(self, vocab: List[str], ids: array, offsets: array, starts: array, safe: array):
+        self.vocab = vocab
+        self._ids = ids
+        self._offsets = offsets
+        self._starts = starts
+        self._safe = safe
+
+    @staticmethod
+    def build(texts: Iterable[str]) -> "TokenCorpus":
+        vocab = []
+        vocab_ids = {}
+        ids = array("I")
+        offsets = array("I")
+        starts = array("I", [0])
+        safe = array("B")
+        for text in texts:
+            words = []
+            for m in RX_TOKEN.finditer(text):
+                word = m.group(0)
+                word_id = vocab_ids.get(word)
+                if word_id is None:
+                    word_id = vocab_ids[word] = len(vocab)
+                    vocab.append(sys.intern(word))
+                ids.append(word_id)
+                offsets.append(m.start())
+                words.append(word)
+            starts.append(len(ids))
+            safe.append("-" not in text and " ".join(words) == text)
+        return TokenCorpus(vocab, _narrow(ids), _narrow(offsets), starts, safe)
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    def token_ids(self, i: int) -> array:
+        '''Return the vocabulary ids of verse <i>'s tokens.'''
+        return self._ids[self._starts[i] : self._starts[i + 1]]
+
+    def tokens(self, i: int) -> List[str]:
+        '''Return verse <i>'s tokens.'''
+        vocab = self.vocab
+        return [vocab[t] for t in self.token_ids(i)]
+
+    def offsets(self, i: int) -> array:
+        '''Return the character offsets of verse <i>'s tokens within its text.'''
+        return self._offsets[self._starts[i] : self._starts[i + 1]]
+
+    def word_count(self, i: int) -> int:
+        return self._starts[i + 1] - self._starts[i]
+
+    def textwrap_safe(self, i: int) -> bool:
+        '''True if verse <i>'s text is exactly its tokens joined by single spaces, none containing
+        a hyphen (so `textwrap` would split it into exactly those words).'''
+        return bool(self._safe[i])
+
+    def save(self, filename: str, stamp: Tuple[int, int]):
+        '''Save to <filename>, recording the source file <stamp> (size, mtime_ns).
+
+        (Written to a temporary file first, so concurrent loaders never see a partial file.)
+        '''
+        vocab = "\n".join(self.vocab).encode("utf8")
+        order = b"L" if sys.byteorder == "little" else b"B"
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as fd:
+                fd.write(MAGIC)
+                typecodes = (self._ids.typecode + self._offsets.typecode).encode("ascii")
+                fd.write(_HEADER.pack(stamp[0], stamp[1], len(vocab), len(self._ids), len(self._starts),
+                                      typecodes, order))
+                fd.write(vocab)
+                for a in (self._ids, self._offsets, self._starts, self._safe):
+                    a.tofile(fd)
+            os.replace(tmp, filename)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @staticmethod
+    def load(filename: str, stamp: Tuple[int, int]) -> Optional["TokenCorpus"]:
+        '''Load from <filename>; returns None if missing, malformed, or saved for a different source <stamp>.'''
+        try:
+            with open(filename, "rb") as fd:
+                if fd.read(len(MAGIC)) != MAGIC:
+                    return None
+                size, mtime, vocab_len, n_ids, n_starts, typecodes, order = _HEADER.unpack(fd.read(_HEADER.size))
+                if (size, mtime) != tuple(stamp) or not set(typecodes) <= set(b"HI"):
+                    return None
+                vocab = fd.read(vocab_len).decode("utf8").split("\n") if vocab_len else []
+                arrays = []
+                for typecode, count in zip(typecodes.decode("ascii") + "IB", (n_ids, n_ids, n_starts, n_starts - 1)):
+                    a = array(typecode)
+                    a.fromfile(fd, count)
+                    arrays.append(a)
+        except (OSError, EOFError, struct.error, UnicodeDecodeError):
+            return None
+        if order != (b"L" if sys.byteorder == "little" else b"B"):
+            for a in arrays:
+                a.byteswap()
+        return TokenCorpus([sys.intern(w) for w in vocab], *arrays)
+
+
+def file_stamp(filename: str) -> Tuple[int, int]:
+    '''Return the (size, mtime_ns) stamp identifying the current version of file <filename>.'''
+    st = os.stat(filename)
+    return (st.st_size, st.st_mtime_ns)
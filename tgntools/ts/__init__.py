@@ -1,15 +1,74 @@
 """Typesetting sub-package.
 
-Defines a standard interface and registry for named typesetter classes
+Defines a standard interface and registry for named typesetter classes.
+
+Typesetter modules are imported lazily, only when their typesetter is requested by name.
+Built-in typesetters are listed in `_BUILTIN_TYPESETTERS`; external packages can provide
+additional typesetters via the "tgntools.typesetters" entry point group, e.g.:
+
+    [project.entry-points."tgntools.typesetters"]
+    markdown = "tgn_markdown:Markdown"
+
+(the entry point name must match the name the Typesetter sub-class registers itself under).
 """
 from __future__ import annotations
-from typing import IO, List
+import importlib
+from typing import IO, Dict, List, Optional
 
 from ..data import VerseRef, BibleBooks
 
 # internal (but global) Typesetter registry
 _TYPESETTER_REGISTRY = {}
 
+# names of built-in typesetters -> (relative) name of the module defining them
+_BUILTIN_TYPESETTERS = {
+    "raw": __name__,
+    "plain": ".txt",
+    "html5": ".html",
+    "tex": ".tex",
+    "sile": ".sile",
+}
+
+ENTRY_POINT_GROUP = "tgntools.typesetters"
+
+# cached entry point discovery results (name -> EntryPoint)
+_entry_points = None
+
+
+def _discover_entry_points() -> Dict[str, object]:
+    global _entry_points
+    if _entry_points is None:
+        from importlib import metadata
+        try:
+            eps = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:
+            # Python < 3.10: entry_points() returns a dict of groups
+            eps = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+        _entry_points = {ep.name: ep for ep in eps}
+    return _entry_points
+
+
+def _load_typesetter(name: str) -> type:
+    try:
+        return _TYPESETTER_REGISTRY[name]
+    except KeyError:
+        pass
+
+    if name in _BUILTIN_TYPESETTERS:
+        importlib.import_module(_BUILTIN_TYPESETTERS[name], __name__)
+    else:
+        ep = _discover_entry_points().get(name)
+        if ep is None:
+            raise KeyError(f"unknown typesetter '{name}'")
+        loaded = ep.load()
+        if isinstance(loaded, type) and issubclass(loaded, Typesetter):
+            _TYPESETTER_REGISTRY.setdefault(name, loaded)
+
+    try:
+        return _TYPESETTER_REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"typesetter module for '{name}' did not register a typesetter by that name")
+
 
 class Typesetter:
     """Base class of all typesetters.  Subclasses must provide a keyword argument "name" for the CLI name.
@@ -20,6 +79,9 @@ class Typesetter:
     It is expected that sub-classes will perform argparse-style parsing of the `argv` array they receive
     and will exit with helpful usage messages as appropriate.
     """
+    # conventional extension for files of this typesetter's output
+    file_extension = ".txt"
+
     def __init__(self, argv: List[str], bb: BibleBooks):
         raise NotImplementedError()
 
@@ -51,27 +113,73 @@ class Typesetter:
         """
         pass
 
+    def section(self, title: str):
+        """Indicate the start of a new edit-list section (a block of comment lines followed by verses).
+
+        <title> is the text of the first comment line of the block.  Called just before the first
+        verse of the section is fed.
+
+        Default: NO-OP
+        """
+        pass
+
     def feed(self, this: VerseRef, text: str):
         """Add another verse reference/text to the typeset document.
         """
         raise NotImplementedError()
 
+    def feed_range(self, refs: List[VerseRef], texts: List[str]):
+        """Add a contiguous span of verses (<refs> and their <texts>) to the typeset document.
+
+        Typesetters can override this to check continuity once per span and emit it in one write.
+
+        Default: calls `feed` for each verse
+        """
+        for this, text in zip(refs, texts):
+            self.feed(this, text)
+
     def finish(self):
         """Perform any end-of-document typesetting tasks.
         """
         raise NotImplementedError()
 
+    def cache_inputs(self) -> Optional[List[str]]:
+        """Return the files (besides the Bible and edit list) this typesetter's output depends on.
+
+        Used to key the CLI's render cache.  Return None if the output can't be cached
+        (e.g., because the typesetter writes files other than its output stream).
+
+        Default: no extra inputs
+        """
+        return []
+
     @staticmethod
-    def get_registered_names() -> List[str]:
+    def get_registered_names(discover: bool = True) -> List[str]:
         """Static method to get all available/registered typesetter names.
+
+        Includes built-in and (with <discover>) entry-point typesetters that have not been imported yet.
+        Discovery scans the metadata of all installed packages, which is slow enough to matter at CLI
+        startup; `new` and `get_class` only do it for names that aren't built in.
+        """
+        names = dict.fromkeys(_BUILTIN_TYPESETTERS)
+        names.update(dict.fromkeys(_TYPESETTER_REGISTRY))
+        if discover:
+            names.update(dict.fromkeys(_discover_entry_points()))
+        return list(names)
+
+    @staticmethod
+    def get_class(name: str) -> type:
+        """Return the named Typesetter sub-class (importing its module on first use).
         """
-        return list(_TYPESETTER_REGISTRY.keys())
+        return _load_typesetter(name)
 
     @staticmethod
     def new(name: str, argv: List[str], bb: BibleBooks) -> Typesetter:
         """Create and return the named typesetter (using the given CLI arguments, if needed).
+
+        Imports the module providing the typesetter on first use.
         """
-        return _TYPESETTER_REGISTRY[name](argv, bb)
+        return _load_typesetter(name)(argv, bb)
 
 class Raw(Typesetter, name="raw"):
     """Simply dump verse contents with no reference data or formatting.
@@ -91,6 +199,9 @@ class Raw(Typesetter, name="raw"):
     def feed(self, this: VerseRef, text: str):
         print(text, file=self._s)
 
+    def feed_range(self, refs: List[VerseRef], texts: List[str]):
+        self._s.write("\n".join(texts) + "\n")
+
     def finish(self):
         self._s.flush()
 
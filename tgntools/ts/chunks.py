@@ -0,0 +1,171 @@
+"""Chunked (multi-file) output support for typesetters.
+
+Splits a document into one file per edit-list section inside a chunk directory,
+so downstream tools (SILE, TeX, make, ...) can re-process only the sections that changed.
+
+Chunk files are named after their section titles (not their position), so inserting
+or removing a section doesn't rename (and hence invalidate) every following chunk.
+A `manifest.json` file in the chunk directory records the chunk list and content hashes;
+chunks whose hash is unchanged are not rewritten (their mtimes are preserved), and
+chunks listed in the previous manifest but no longer produced are removed.
+
+Written files can also get precompressed sidecars (`FILE.gz`, `FILE.br`) for static web serving;
+brotli support requires the optional `brotli` package.
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from typing import IO, Iterable, List, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FILE = "manifest.json"
+
+# precompression format name -> (sidecar file extension, compression function)
+COMPRESSORS = {
+    "gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+}
+if brotli is not None:
+    COMPRESSORS["br"] = (".br", lambda data: brotli.compress(data))
+
+RX_SLUG_JUNK = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(title: str, max_len: int = 40) -> str:
+    """Return a filename-safe slug for a section title."""
+    slug = RX_SLUG_JUNK.sub("-", title.lower()).strip("-")
+    return slug[:max_len].rstrip("-") or "section"
+
+
+def content_hash(text: str) -> str:
+    """Return the (hex) content hash used to detect changed chunks."""
+    return hashlib.sha1(text.encode("utf8")).hexdigest()
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Write <text> to file <path> unless it already has exactly that content; returns True if written."""
+    try:
+        with open(path, "rt", encoding="utf8") as fd:
+            if fd.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, "wt", encoding="utf8") as fd:
+        fd.write(text)
+    return True
+
+
+def precompress(path: str, formats: Iterable[str], missing_only: bool = False):
+    """Write precompressed sidecars of file <path> for each of <formats> (keys of COMPRESSORS).
+
+    With <missing_only>, only sidecars that don't exist yet are written.
+    """
+    formats = [fmt for fmt in formats if not (missing_only and os.path.exists(path + COMPRESSORS[fmt][0]))]
+    if not formats:
+        return
+    with open(path, "rb") as fd:
+        data = fd.read()
+    for fmt in formats:
+        ext, compress = COMPRESSORS[fmt]
+        with open(path + ext, "wb") as fd:
+            fd.write(compress(data))
+
+
+def stream_dir(stream: IO) -> str:
+    """Return the directory of the file <stream> writes to (the current directory for other streams)."""
+    name = getattr(stream, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return os.path.dirname(os.path.abspath(name))
+    return os.curdir
+
+
+class ChunkedOutput:
+    """Collects named output chunks and writes the changed ones into a directory.
+
+    Usage: call `.begin(title)` to start each chunk (returns its filename and a text stream to write it to),
+    then `.close()` once to flush all chunks and the manifest to disk.
+    """
+    def __init__(self, directory: str, extension: str, precompress: Iterable[str] = ()):
+        self.directory = directory
+        self._extension = extension
+        self._precompress = list(precompress)
+        self._chunks = []   # list of (title, filename, StringIO)
+        self._names = set()
+        self.rewritten = [] # filenames actually (re)written by .close()
+
+    def begin(self, title: str) -> Tuple[str, io.StringIO]:
+        """Start a new chunk for section <title>; returns its filename and the stream to write its content to."""
+        base = slugify(title)
+        name = base + self._extension
+        n = 1
+        while name in self._names:
+            n += 1
+            name = f"{base}-{n}{self._extension}"
+        self._names.add(name)
+
+        stream = io.StringIO()
+        self._chunks.append((title, name, stream))
+        return name, stream
+
+    def path(self, filename: str) -> str:
+        """Return the path of chunk <filename> (relative to the current working directory)."""
+        return os.path.join(self.directory, filename)
+
+    def link(self, filename: str, base_dir: str) -> str:
+        """Return the path of <filename> in the chunk directory relative to <base_dir> (with "/" separators),
+        for referencing it from a document in <base_dir> (e.g., the master document; see `stream_dir`).
+        """
+        return os.path.relpath(self.path(filename), base_dir).replace(os.sep, "/")
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.path(MANIFEST_FILE), "rt", encoding="utf8") as fd:
+                return {c["file"]: c["hash"] for c in json.load(fd)["chunks"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def close(self) -> List[str]:
+        """Write new/changed chunks, delete stale ones, update the manifest.
+
+        Returns the list of chunk filenames that were (re)written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        old_hashes = self._load_manifest()
+
+        manifest = []
+        self.rewritten = []
+        for title, name, stream in self._chunks:
+            text = stream.getvalue()
+            digest = content_hash(text)
+            manifest.append({"file": name, "title": title, "hash": digest})
+            if old_hashes.get(name) != digest or not os.path.exists(self.path(name)):
+                with open(self.path(name), "wt", encoding="utf8") as fd:
+                    fd.write(text)
+                precompress(self.path(name), self._precompress)
+                self.rewritten.append(name)
+            else:
+                precompress(self.path(name), self._precompress, missing_only=True)
+
+        for name in old_hashes:
+            if name not in self._names:
+                for ext in [""] + [ext for ext, _ in COMPRESSORS.values()]:
+                    try:
+                        os.remove(self.path(name) + ext)
+                    except OSError:
+                        pass
+
+        self.write_file(MANIFEST_FILE, json.dumps({"chunks": manifest}, indent=2))
+        return self.rewritten
+
+    def write_file(self, filename: str, text: str) -> bool:
+        """Write an auxiliary (non-chunk) file into the chunk directory, if changed (and precompress it)."""
+        os.makedirs(self.directory, exist_ok=True)
+        changed = write_if_changed(self.path(filename), text)
+        precompress(self.path(filename), self._precompress, missing_only=not changed)
+        return changed
@@ -0,0 +1,32 @@
+// Lazy loader for paginated TGN HTML5 output: appends the section fragments listed
+// in the chunk manifest, one at a time, as the reader scrolls near the end of the page.
+// Must immediately follow the sentinel element (which carries the manifest URL).
+(function () {
+    var more = document.currentScript.previousElementSibling;
+    var url = more.getAttribute("data-manifest");
+    var base = url.replace(/[^\/]*$/, "");
+    fetch(url).then(function (r) { return r.json(); }).then(function (manifest) {
+        var queue = manifest.chunks;
+        var busy = false;
+        var observer = new IntersectionObserver(function (entries) {
+            if (busy || !entries.some(function (e) { return e.isIntersecting; })) {
+                return;
+            }
+            var chunk = queue.shift();
+            if (!chunk) {
+                observer.disconnect();
+                more.remove();
+                return;
+            }
+            busy = true;
+            fetch(base + chunk.file + "?v=" + chunk.hash).then(function (r) { return r.text(); }).then(function (html) {
+                more.insertAdjacentHTML("beforebegin", html);
+                busy = false;
+                // re-observe so we get called again if the sentinel is still in view
+                observer.unobserve(more);
+                observer.observe(more);
+            });
+        }, { rootMargin: "200%" });
+        observer.observe(more);
+    });
+})();
@@ -6,19 +6,68 @@
     * if book/chapter changed from previous verse, inserts <div class="tgn-verse-chapter">`chapter`</div> and <div class="tgn-verse-book">`book`</div>
     * if non-contiguous with last verse, inserts <hr class="tgn-ellipsis" /> before all
 
+Paginated mode (`--pages DIR`):
+
+* the output stream receives a small index page containing the first edit-list section,
+  a link to a shared external stylesheet (copied to DIR), and a lazy-loader script
+* every later section is written to its own HTML fragment in DIR (see `chunks.py`),
+  listed in order in DIR/manifest.json (the table of contents the loader fetches)
+* each section starts with full book/chapter labels, so fragments don't depend on their neighbors
+
+Compact mode (`--compact`):
+
+* no indentation, and short class names (see `COMPACT_CLASSES`) with no prefix, applied to the
+  (minified) stylesheet as well
+* the book label is only emitted when the book changes (not on every chapter change)
+
+With `--precompress gzip` (or `br`, given the optional `brotli` package), gzip/brotli sidecar files
+(`FILE.gz`/`FILE.br`) are written next to every output file (the `-o` output file and/or pages).
 """
 import argparse
 import os
+import re
 from typing import IO, List, Optional
 
 from ..data import VerseRef, BibleBooks
 from ..ts import Typesetter
+from .chunks import ChunkedOutput, COMPRESSORS, MANIFEST_FILE, precompress, stream_dir
 
 
 DEFAULT_STYLE_FILE = os.path.join(os.path.dirname(__file__), "default-html5-styles.css")
+LOADER_SCRIPT_FILE = os.path.join(os.path.dirname(__file__), "default-html5-loader.js")
+
+# class names (sans prefix) -> compact-mode class names
+COMPACT_CLASSES = {
+    "content": "c",
+    "verse-box": "b",
+    "verse-text": "t",
+    "verse-number": "n",
+    "verse-chapter": "h",
+    "verse-book": "k",
+    "skip": "s",
+    "debug": "d",
+    "more": "m",
+}
+
+RX_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+RX_CSS_SPACE = re.compile(r"\s*([{};:,>])\s*")
+RX_CSS_WS = re.compile(r"\s+")
+
+
+def minify_css(css: str) -> str:
+    """Return <css> with comments and insignificant whitespace removed.
+
+    (Simple-minded: assumes no string literals containing those characters/spaces.)
+    """
+    css = RX_CSS_COMMENT.sub("", css)
+    css = RX_CSS_WS.sub(" ", css)
+    css = RX_CSS_SPACE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
 
 
 class Html5(Typesetter, name="html5"):
+    file_extension = ".html"
+
     def __init__(self, argv: List[str], bb: BibleBooks):
         ap = argparse.ArgumentParser(description="HTML5 typesetter")
         ap.add_argument("-c", "--class-prefix", type=str, default="tgn",
@@ -27,16 +76,29 @@ class Html5(Typesetter, name="html5"):
                         help="CSS file to paste into output HTML.")
         ap.add_argument("-i", "--inline-styles", type=bool, default=True,
                         help="Inject CSS into HTML instead of adding a stylesheet link")
+        ap.add_argument("-p", "--pages", type=str, default=None, metavar="DIR",
+                        help="Paginated mode: write later sections as lazy-loaded fragments (plus stylesheet) into DIR")
+        ap.add_argument("-C", "--compact", default=False, action="store_true",
+                        help="Compact output: no indentation, short class names, minified CSS")
+        ap.add_argument("-z", "--precompress", action="append", default=[], choices=sorted(COMPRESSORS),
+                        help="Write precompressed sidecar files in this format (may be repeated)")
         args = ap.parse_args(argv)
 
         self._bb = bb 
         self._prefix = args.class_prefix
         self._style_sheet_file = args.style_sheet
-        self._inline_styles = args.inline_styles
+        self._inline_styles = args.inline_styles and args.pages is None
+        self._pages_dir = args.pages
+        self._compact = args.compact
+        self._precompress = args.precompress
 
         self._last = VerseRef("n/a", 0, 0)
+        self._master = None
         self._out = None
+        self._chunks = None
+        self._sections = 0
         self._indent = 0
+        self._indent_step = 0 if self._compact else 4
         self._open_tags = []
 
     def _emit(self, line: str):
@@ -44,9 +106,23 @@ class Html5(Typesetter, name="html5"):
             raise RuntimeError("cannot emit HTML before .start(..)")
         print(" "*self._indent + line, file=self._out)
 
+    def _class(self, klass: str) -> str:
+        if self._compact:
+            return COMPACT_CLASSES.get(klass, klass)
+        return f"{self._prefix}-{klass}"
+
+    def _style_sheet(self) -> str:
+        with open(self._style_sheet_file, "rt", encoding="utf8") as fd:
+            css = fd.read()
+        if self._compact:
+            rx_class = re.compile(r"\." + re.escape(self._prefix) + r"-([A-Za-z0-9-]+)")
+            css = rx_class.sub(lambda m: "." + COMPACT_CLASSES.get(m.group(1), m.group(0)[1:]), css)
+            css = minify_css(css)
+        return css
+
     def _tag(self, tag: str, contents: Optional[str], klass: Optional[str] = None):
         if klass:
-            opener = f'<{tag} class="{self._prefix}-{klass}"'
+            opener = f'<{tag} class="{self._class(klass)}"'
         else:
             opener = f'<{tag}'
 
@@ -57,30 +133,35 @@ class Html5(Typesetter, name="html5"):
 
     def _open(self, tag: str, klass: Optional[str] = None):
         if klass:
-            self._emit(f'<{tag} class="{self._prefix}-{klass}">')
+            self._emit(f'<{tag} class="{self._class(klass)}">')
         else:
             self._emit(f'<{tag}>')
         self._open_tags.append(tag)
-        self._indent += 4
+        self._indent += self._indent_step
 
     def _close(self):
-        self._indent -= 4
+        self._indent -= self._indent_step
         tag = self._open_tags.pop()
         self._emit(f'</{tag}>')
 
     def start(self, target_stream: IO):
         self._last = VerseRef("n/a", 0, 0)
-        self._out = target_stream
+        self._master = self._out = target_stream
+        self._sections = 0
+        if self._pages_dir is not None:
+            self._chunks = ChunkedOutput(self._pages_dir, ".html", precompress=self._precompress)
+            self._base_dir = stream_dir(target_stream) # (page URLs are relative to the index page)
 
         self._open("html")
         self._open("head")
         self._tag("title", "The Gospel Narrative")
         if self._inline_styles:
             self._open("style")
-            with open(self._style_sheet_file, "rt", encoding="utf8") as fd:
-                for line in fd:
-                    self._emit(line.rstrip())
+            for line in self._style_sheet().splitlines():
+                self._emit(line.rstrip())
             self._close()
+        elif self._chunks is not None:
+            self._emit(f'<link rel="stylesheet" href="{self._chunks.link(os.path.basename(self._style_sheet_file), self._base_dir)}">')
         else:
             self._emit(f'<link rel="stylesheet" href="{self._style_sheet_file}">')
         self._close()
@@ -90,8 +171,17 @@ class Html5(Typesetter, name="html5"):
     def debug(self, msg: str):
         self._tag("pre", msg, "debug")
 
+    def section(self, title: str):
+        if self._chunks is None:
+            return
+        # the first section stays inline in the index page (for a fast first paint)
+        if self._sections > 0:
+            _, self._out = self._chunks.begin(title)
+        self._sections += 1
+        self._last = VerseRef("n/a", 0, 0)
+
     def feed(self, this: VerseRef, text: str):
-        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_congituous(self._last, this):
+        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_contiguous(self._last, this):
             self._tag("hr", None, "skip")
 
         self._open("div", "verse-box")
@@ -99,15 +189,43 @@ class Html5(Typesetter, name="html5"):
         self._tag("div", this.verse, "verse-number")
         if this.chapter != self._last.chapter or this.book != self._last.book:
             self._tag("div", this.chapter, "verse-chapter")
-            self._tag("div", self._bb.pretty_name(this.book), "verse-book")
+            if not self._compact or this.book != self._last.book:
+                self._tag("div", self._bb.pretty_name(this.book), "verse-book")
         self._close()
         self._last = this
 
     def finish(self):
+        if self._chunks is not None:
+            self._out = self._master
+            self._finish_pages()
         while self._open_tags:
             self._close()
         self._out.flush()
 
+        # precompress the main output too, if it went to a regular file
+        out_file = getattr(self._out, "name", None)
+        if self._precompress and isinstance(out_file, str) and os.path.isfile(out_file):
+            precompress(out_file, self._precompress)
+
+    def cache_inputs(self) -> Optional[List[str]]:
+        if self._pages_dir is not None or self._precompress:
+            return None # we write other files
+        return [self._style_sheet_file]
+
+    def _finish_pages(self):
+        # sentinel element (immediately followed by the loader script) marking where fragments go
+        manifest = self._chunks.link(MANIFEST_FILE, self._base_dir)
+        self._emit(f'<div class="{self._class("more")}" data-manifest="{manifest}"></div>')
+        with open(LOADER_SCRIPT_FILE, "rt", encoding="utf8") as fd:
+            script = fd.read()
+        self._open("script")
+        for line in script.splitlines():
+            self._emit(line)
+        self._close()
+
+        self._chunks.close()
+        self._chunks.write_file(os.path.basename(self._style_sheet_file), self._style_sheet())
+
 
 
 
@@ -4,11 +4,25 @@ Unlike the Tex and HTML typesetters that were focused on highly-versified layout
 the SILE typesetter produces an inline layout.  References are minimized and typeset
 as grayed out small superscripts.
 
-(BONUS: create a custom SILE document class/typesetter that can keep track of context
-and automagically de-minimize the first reference of the page
+With `--page-refs`, each \\vref also carries its full reference as an option
+(e.g., \\vref[ref=Gen 1:3]{3}); the `booklet` document class (classes/booklet.lua)
+collects these while shipping out each page and typesets the first full reference
+of the page in a running header, so page-aware references need only a single SILE run.
+This requires a `class=booklet` prelude: `--page-refs` defaults to the bundled
+`default-sile-booklet-prelude.sil` (run SILE from the project directory, so it finds
+classes/booklet.lua); other preludes that \\define their own \\vref ignore the option.
+The in-text references stay minimized (e.g., just "3" after Gen 1:2): the full
+reference only goes to the running header.
+
+With `--chunk-dir DIR`, the output stream receives only the master document
+(prelude, one \\include per edit-list section, postlude) and each section is written
+to its own file in DIR (see `chunks.py`); only sections whose content changed are
+rewritten.  Every section starts with a full reference, so chunks don't depend on
+their neighbors.
 
 * start: emits SILE prelude, including definitions for \\vref and \\gap
 * debug: ignored
+* section: (chunked mode only) starts a new chunk file and \\include's it
 * feed: emits \\vref, \\gap, verse text, and \verse ... command sequence (possibly preceeded by a \discontinuity sequence)
 * finish: emits SILE postlude and flushes output
 
@@ -39,9 +53,11 @@ from typing import IO, List, Optional
 
 from ..data import VerseRef, BibleBooks
 from ..ts import Typesetter
+from .chunks import ChunkedOutput, stream_dir
 
 
 DEFAULT_PRELUDE_FILE = os.path.join(os.path.dirname(__file__), "default-sile-prelude.sil")
+BOOKLET_PRELUDE_FILE = os.path.join(os.path.dirname(__file__), "default-sile-booklet-prelude.sil")
 
 SILE_CHARS = re.compile(r"[%{}\\]")
 SILE_REPLACEMENTS = {
@@ -58,30 +74,55 @@ def silescape(verbatim: str) -> str:
 
 
 class Sile(Typesetter, name="sile"):
+    file_extension = ".sil"
+
     def __init__(self, argv: List[str], bb: BibleBooks):
         ap = argparse.ArgumentParser(description="Statement-size inline SILE typesetter")
-        ap.add_argument("-p", "--prelude", type=str, default=DEFAULT_PRELUDE_FILE,
-                        help="SILE prelude file defining \\vref and \\gap")
+        ap.add_argument("-p", "--prelude", type=str, default=None,
+                        help="SILE prelude file defining \\vref and \\gap (default: a bundled prelude; "
+                             "with --page-refs, one using class=booklet)")
+        ap.add_argument("-r", "--page-refs", default=False, action="store_true",
+                        help="Pass full references to \\vref, for page-aware running-head references "
+                             "(requires a class=booklet prelude; see classes/booklet.lua)")
+        ap.add_argument("--chunk-dir", type=str, default=None,
+                        help="Write each edit-list section to its own file in this directory (output is the master document)")
         args = ap.parse_args(argv)
 
-        self._prelude_file = args.prelude
+        self._prelude_file = args.prelude or (BOOKLET_PRELUDE_FILE if args.page_refs else DEFAULT_PRELUDE_FILE)
+        self._page_refs = args.page_refs
+        self._chunk_dir = args.chunk_dir
 
         self._bb = bb
         self._last = VerseRef("n/a", 0, 0)
+        self._master = None
         self._out = None
+        self._chunks = None
         self._para = False
     
     def start(self, target_stream: IO):
-        self._out = target_stream
+        self._last = VerseRef("n/a", 0, 0)
+        self._master = self._out = target_stream
         with open(self._prelude_file, "rt", encoding="utf8") as fd:
             for line in fd:
                 self._emit(line.rstrip())
+        if self._chunk_dir is not None:
+            self._chunks = ChunkedOutput(self._chunk_dir, ".sil")
+            self._base_dir = stream_dir(target_stream) # (chunk paths are relative to the master document)
     
     def _emit(self, text: str, end="\n"):
         if not self._out:
             raise RuntimeError("Cannot emit output before self.start(...)")
         print(text, file=self._out, end=end)
 
+    def section(self, title: str):
+        if self._chunks is None:
+            return
+        name, self._out = self._chunks.begin(title)
+        self._emit(f"% {title}")
+        print(f"\\include[src={self._chunks.link(name, self._base_dir)}]", file=self._master)
+        # start each chunk from scratch (full reference, no leading gap)
+        self._last = VerseRef("n/a", 0, 0)
+
     def debug(self, msg: str):
         print(msg, file=sys.stderr) # no actuall inline debugging supported
     
@@ -89,23 +130,51 @@ class Sile(Typesetter, name="sile"):
         self._emit("\n") # produces double-EOL, paragraph break
         self._para = True
 
-    def feed(self, this: VerseRef, text: str):
-        if not self._para and self._bb.is_valid_ref(self._last) and not self._bb.refs_are_contiguous(self._last, this):
+    def _begin_span(self, first: VerseRef):
+        if self._chunks is not None and self._out is self._master:
+            self.section("front") # verses before the first section comment
+
+        if not self._para and self._bb.is_valid_ref(self._last) and not self._bb.refs_are_contiguous(self._last, first):
             self._emit("\\gap{}", end="")
 
+    def _verse(self, this: VerseRef, text: str) -> str:
+        # returns SILE source for one verse (and updates the minimization state)
+        parts = []
+        if self._page_refs:
+            pretty_book = silescape(self._bb.pretty_name(this.book, short=True))
+            parts.append(f"\\goodbreak{{}}\\vref[ref={pretty_book} {this.chapter}:{this.verse}]{{")
+        else:
+            parts.append("\\goodbreak{}\\vref{")
         full = False
-        self._emit("\\goodbreak{}\\vref{", end="")
         if self._last.book != this.book:
             pretty_book = silescape(self._bb.pretty_name(this.book, short=True))
-            self._emit(pretty_book, end=" ")
+            parts.append(pretty_book + " ")
             full = True
         if full or self._last.chapter != this.chapter:
-            self._emit(f"{this.chapter}:", end="")
-        self._emit(f"{this.verse}}}\\nobreak{{}}{silescape(text)}")
+            parts.append(f"{this.chapter}:")
+        parts.append(f"{this.verse}}}\\nobreak{{}}{silescape(text)}")
         self._last = this
         self._para = False
+        return "".join(parts)
+
+    def feed(self, this: VerseRef, text: str):
+        self._begin_span(this)
+        self._emit(self._verse(this, text))
+
+    def feed_range(self, refs: List[VerseRef], texts: List[str]):
+        # verses in a range are contiguous: only the first needs a continuity check
+        self._begin_span(refs[0])
+        self._emit("\n".join([self._verse(this, text) for this, text in zip(refs, texts)]))
     
     def finish(self):
+        if self._chunks is not None:
+            self._chunks.close()
+            self._out = self._master
         self._emit("\\end{document}")
         self._out.flush()
 
+    def cache_inputs(self) -> Optional[List[str]]:
+        if self._chunk_dir is not None:
+            return None
+        return [self._prelude_file]
+
@@ -5,6 +5,12 @@
 * feed: emits \verse ... command sequence (possibly preceeded by a \discontinuity sequence)
 * finish: emits \end and flushes output
 
+Chunked mode (`--chunk-dir DIR`): the output stream receives only the master file
+(prelude, one \input per edit-list section, \end) and each section is written to
+its own file in DIR (see `chunks.py`).  Only chunks whose content hash changed are
+rewritten, so incremental builds (make, latexmk, ...) touch only modified sections.
+Each chunk starts without a \discontinuity, so chunks don't depend on their neighbors.
+
 Notes:
 ------
 
@@ -33,6 +39,7 @@ from typing import IO, List, Optional
 
 from ..data import VerseRef, BibleBooks
 from ..ts import Typesetter
+from .chunks import ChunkedOutput, stream_dir
 
 
 DEFAULT_PRELUDE_FILE = os.path.join(os.path.dirname(__file__), "default-plaintex-prelude.tex")
@@ -58,23 +65,34 @@ def texscape(verbatim: str) -> str:
 
 
 class PlainTeX(Typesetter, name="tex"):
+    file_extension = ".tex"
+
     def __init__(self, argv: List[str], bb: BibleBooks):
         ap = argparse.ArgumentParser(description="Plain TeX typesetter")
         ap.add_argument("-p", "--prelude", type=str, default=DEFAULT_PRELUDE_FILE,
                         help="TeX prelude file defining \\verse and \\discontinuity")
+        ap.add_argument("--chunk-dir", type=str, default=None,
+                        help="Write each edit-list section to its own file in this directory (output is the master file)")
         args = ap.parse_args(argv)
 
         self._prelude_file = args.prelude
+        self._chunk_dir = args.chunk_dir
 
         self._bb = bb
         self._last = VerseRef("n/a", 0, 0)
+        self._master = None
         self._out = None
+        self._chunks = None
     
     def start(self, target_stream: IO):
-        self._out = target_stream
+        self._last = VerseRef("n/a", 0, 0)
+        self._master = self._out = target_stream
         with open(self._prelude_file, "rt", encoding="utf8") as fd:
             for line in fd:
                 self._emit(line.rstrip())
+        if self._chunk_dir is not None:
+            self._chunks = ChunkedOutput(self._chunk_dir, ".tex")
+            self._base_dir = stream_dir(target_stream) # (chunk paths are relative to the master document)
     
     def _emit(self, text: str):
         if not self._out:
@@ -84,8 +102,19 @@ class PlainTeX(Typesetter, name="tex"):
     def debug(self, msg: str):
         self._emit(f"\line{{\\tt {texscape(msg)}}}")
 
+    def section(self, title: str):
+        if self._chunks is None:
+            return
+        name, self._out = self._chunks.begin(title)
+        self._emit(f"% {title}")
+        print(f"\\input {self._chunks.link(name, self._base_dir)}", file=self._master)
+        self._last = VerseRef("n/a", 0, 0)
+
     def feed(self, this: VerseRef, text: str):
-        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_congituous(self._last, this):
+        if self._chunks is not None and self._out is self._master:
+            self.section("front") # verses before the first section comment
+
+        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_contiguous(self._last, this):
             self._emit("\discontinuity")
             csname = "\\hardverse"
         else:
@@ -95,6 +124,14 @@ class PlainTeX(Typesetter, name="tex"):
         self._last = this
     
     def finish(self):
+        if self._chunks is not None:
+            self._chunks.close()
+            self._out = self._master
         self._emit("\\end")
         self._out.flush()
 
+    def cache_inputs(self) -> Optional[List[str]]:
+        if self._chunk_dir is not None:
+            return None
+        return [self._prelude_file]
+
@@ -9,10 +9,14 @@ reference text/numbers right-aligned to that point.
 
 Book name/chapter number are printed only when transitioning chapter/book.
 Non-contiguous verses are separated by a line of ". . ." characters in the text column.
+
+If the Bible has its token corpus loaded (see `BibleBooks.tokens`), verse text is wrapped
+from its pre-split words; otherwise (or for text `textwrap` would treat differently, e.g.
+hyphenated or over-long words), with `textwrap`.  Both produce the same output.
 """
 import argparse
 import textwrap
-from typing import IO, List
+from typing import IO, List, Optional
 
 from ..data import VerseRef, BibleBooks
 from ..ts import Typesetter
@@ -28,18 +32,18 @@ class Plaintext(Typesetter, name="plain"):
 
         self._bb = bb 
         self._max_column = args.max_column
-        if args.verse_column is not None:
-            self._text_column = args.verse_column
-        else:
-            longest_n = -1
-            longest_key = None
-            for key, name in self._bb.pretty_names():
-                if len(name) > longest_n:
-                    longest_n = len(name)
-                    longest_key = key
-            self._text_column = len(self._format_full_ref(longest_key, 99, 999))
+        self._text_column = args.verse_column
         self._last = VerseRef("n/a", 0, 0)
 
+    def _auto_text_column(self) -> int:
+        longest_n = -1
+        longest_key = None
+        for key, name in self._bb.pretty_names():
+            if len(name) > longest_n:
+                longest_n = len(name)
+                longest_key = key
+        return len(self._format_full_ref(longest_key, 99, 999))
+
     def _format_full_ref(self, book, chapter, verse) -> str:
         pretty_name = self._bb.pretty_name(book)
         return f"{pretty_name} {chapter}:{verse} - "
@@ -47,7 +51,30 @@ class Plaintext(Typesetter, name="plain"):
     def _format_short_ref(self, verse) -> str:
         return f"{verse} - "
 
+    def _fill_words(self, words: List[str], indent: str) -> Optional[str]:
+        # greedy line filling, as textwrap.fill (minus the first line's indent), of a
+        # textwrap-safe verse's words; returns None where textwrap would split a long word
+        width = self._max_column
+        lines = []
+        line = None
+        for word in words:
+            if len(indent) + len(word) > width:
+                return None
+            if line is None:
+                line = indent + word
+            elif len(line) + 1 + len(word) <= width:
+                line += " " + word
+            else:
+                lines.append(line)
+                line = indent + word
+        if line is not None:
+            lines.append(line)
+        return "\n".join(lines).lstrip()
+
     def start(self, target_stream: IO):
+        # (calculated here rather than in the ctor, so constructing us doesn't touch the Bible)
+        if self._text_column is None:
+            self._text_column = self._auto_text_column()
         self._last = VerseRef("n/a", 0, 0)
         self._out = target_stream
 
@@ -56,7 +83,7 @@ class Plaintext(Typesetter, name="plain"):
 
     def feed(self, this: VerseRef, text: str):
         indent = ' '*self._text_column
-        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_congituous(self._last, this):
+        if self._bb.is_valid_ref(self._last) and not self._bb.refs_are_contiguous(self._last, this):
             self._out.write(indent + ". . .\n")
 
         if this.chapter != self._last.chapter or this.book != self._last.book:
@@ -64,7 +91,11 @@ class Plaintext(Typesetter, name="plain"):
         else:
             leader = self._format_short_ref(this.verse)
         
-        body = textwrap.fill(text, width=self._max_column, initial_indent=indent, subsequent_indent=indent).lstrip()
+        body = None
+        if self._bb.tokenized and self._bb.textwrap_safe(this, text):
+            body = self._fill_words(self._bb.tokens(this), indent)
+        if body is None:
+            body = textwrap.fill(text, width=self._max_column, initial_indent=indent, subsequent_indent=indent).lstrip()
         self._out.write(leader.rjust(self._text_column) + body + "\n")
         self._last = this
 
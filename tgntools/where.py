@@ -0,0 +1,118 @@
+'''Reference-range queries over edit lists ("which edit lines include this verse?").
+
+Each reference line of an edit list resolves to one or more contiguous spans of verses,
+i.e., intervals of verse ordinals (see `BibleBooks.ordinal`).  `IntervalIndex` stores such
+intervals in an implicit, augmented interval tree (sorted by start, with the maximum end of
+each subtree), answering point and range queries in O(log n + k) time for k results.
+'''
+from collections import namedtuple
+from typing import Iterable, List, Optional, Tuple
+
+from .data import BibleBooks, VerseRef
+from .refs import parse_ref_spans
+
+# an edit-list line's contiguous span: <line> is 1-based, <text> the stripped line
+Entry = namedtuple("Entry", ("source", "line", "text", "start", "end"))
+
+
+class IntervalIndex:
+    '''Static index of closed integer intervals [lo, hi], each with a payload.
+    '''
+    def __init__(self, intervals: Iterable[Tuple[int, int, object]]):
+        items = sorted(intervals, key=lambda t: (t[0], t[1]))
+        self._lo = [t[0] for t in items]
+        self._hi = [t[1] for t in items]
+        self._payload = [t[2] for t in items]
+        # max hi within the implicit subtree rooted at each position (see _build)
+        self._max_hi = [0] * len(items)
+        self._build(0, len(items))
+
+    def __len__(self) -> int:
+        return len(self._lo)
+
+    def _build(self, lo: int, hi: int) -> Optional[int]:
+        # the subtree covering positions [lo, hi) is rooted at their midpoint
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._hi[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_hi[mid] = best
+        return best
+
+    def overlapping(self, lo: int, hi: int) -> List[object]:
+        '''Return the payloads of all intervals overlapping [lo, hi] (in order of interval start).'''
+        found = []
+        stack = [(0, len(self._lo))]
+        while stack:
+            a, b = stack.pop()
+            if a >= b:
+                continue
+            mid = (a + b) // 2
+            if self._max_hi[mid] < lo:
+                continue # nothing in this subtree reaches <lo>
+            if self._lo[mid] <= hi:
+                if self._hi[mid] >= lo:
+                    found.append(mid)
+                stack.append((mid + 1, b))
+            stack.append((a, mid))
+        return [self._payload[i] for i in sorted(found)]
+
+    def containing(self, point: int) -> List[object]:
+        '''Return the payloads of all intervals containing <point>.'''
+        return self.overlapping(point, point)
+
+
+class EditListIndex:
+    '''Index of an edit list's resolved verse spans, by line.
+
+    Raises a KeyError (from `BibleBooks.ordinal`) if a line refers to verses not in <bb>.
+    '''
+    def __init__(self, lines: Iterable[str], bb: BibleBooks, source: str = "<edits>"):
+        self._bb = bb
+        self.source = source
+        self.entries = []
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            for start, end in parse_ref_spans(line, bb):
+                self.entries.append(Entry(source, i + 1, line, start, end))
+        self._index = IntervalIndex((bb.ordinal(e.start), bb.ordinal(e.end), e) for e in self.entries)
+
+    @staticmethod
+    def fromfile(filename: str, bb: BibleBooks) -> "EditListIndex":
+        with open(filename, "rt", encoding="utf8") as fd:
+            return EditListIndex(fd, bb, filename)
+
+    def covering(self, ref: VerseRef) -> List[Entry]:
+        '''Return the spans (one per edit-list line and span) that include verse <ref>.'''
+        return self._index.containing(self._bb.ordinal(ref))
+
+    def overlapping(self, start: VerseRef, end: VerseRef) -> List[Entry]:
+        '''Return the spans that include any verse from <start> through <end>.'''
+        return self._index.overlapping(self._bb.ordinal(start), self._bb.ordinal(end))
+
+    def query(self, ref: str) -> List[Entry]:
+        '''Return the lines including any verse of reference string <ref> (in `parse_ref` syntax).
+
+        (One Entry per line: that line's first matching span.)
+        '''
+        found = {}
+        for start, end in parse_ref_spans(ref, self._bb):
+            for e in self.overlapping(start, end):
+                found.setdefault(e.line, e)
+        return sorted(found.values(), key=lambda e: e.line)
+
+    def overlaps(self, other: "EditListIndex") -> List[Tuple[Entry, Entry]]:
+        '''Return (our line, <other>'s line) pairs sharing at least one verse.
+
+        (One pair of Entries per pair of lines: their first overlapping spans.)
+        '''
+        found = {}
+        for mine in self.entries:
+            for theirs in other.overlapping(mine.start, mine.end):
+                found.setdefault((mine.line, theirs.line), (mine, theirs))
+        return [found[k] for k in sorted(found)]